@@ -0,0 +1,213 @@
+# BaccaratBacktest.py
+
+import argparse
+
+import numpy as np
+
+from BaccaratLogic import BANKER, NUM_DECKS, OUTCOMES, PLAYER, TIE, simulate_many
+from BaccaratOdds import NET_RESULT
+
+
+class FlatBet:
+    """
+    Stakes the same number of units on the same outcome every hand.
+
+    Args:
+        choice (int): Outcome code to bet on.
+        units (int): Units staked per hand.
+    """
+
+    def __init__(self, choice=BANKER, units=1):
+        self.choice = choice
+        self.units = units
+
+    def start(self, num_sessions):
+        self.num_sessions = num_sessions
+
+    def bet(self, hand, winners, last_net):
+        return np.full(self.num_sessions, self.choice), np.full(self.num_sessions, self.units)
+
+
+class Martingale:
+    """
+    Doubles the stake after every loss and returns to the base stake after a
+    win; a push keeps the stake.
+
+    Args:
+        choice (int): Outcome code to bet on.
+        base_units (int): Stake after a win.
+        max_units (int, optional): Table limit on the stake.
+    """
+
+    def __init__(self, choice=BANKER, base_units=1, max_units=None):
+        self.choice = choice
+        self.base_units = base_units
+        self.max_units = max_units
+
+    def start(self, num_sessions):
+        self.units = np.full(num_sessions, self.base_units, dtype=np.int64)
+
+    def bet(self, hand, winners, last_net):
+        if last_net is not None:
+            self.units = np.where(last_net < 0, self.units * 2, np.where(last_net > 0, self.base_units, self.units))
+            if self.max_units is not None:
+                np.minimum(self.units, self.max_units, out=self.units)
+        return np.full(len(self.units), self.choice), self.units
+
+
+class FollowTheShoe:
+    """
+    Bets on whichever of Banker or Player won the last decided hand (Banker
+    before any hand is decided).
+
+    Args:
+        units (int): Units staked per hand.
+    """
+
+    def __init__(self, units=1):
+        self.units = units
+
+    def start(self, num_sessions):
+        self.choice = np.full(num_sessions, BANKER)
+
+    def bet(self, hand, winners, last_net):
+        if hand > 0:
+            last = winners[:, hand - 1]
+            self.choice = np.where(last == TIE, self.choice, last)
+        return self.choice, np.full(len(self.choice), self.units)
+
+
+class ModelBet:
+    """
+    Bets on the compiled model's suggestion for the last history_length
+    outcomes, starting each session from a history of Ties as BaccaratMain does.
+
+    Args:
+        model (CompiledModel): Compiled outcome model.
+        units (int): Units staked per hand.
+    """
+
+    def __init__(self, model, units=1):
+        self.model = model
+        self.units = units
+
+    def start(self, num_sessions):
+        self.history = np.full((num_sessions, self.model.history_length), TIE)
+
+    def bet(self, hand, winners, last_net):
+        if hand > 0:
+            self.history = np.hstack([self.history[:, 1:], winners[:, hand - 1:hand]])
+        return self.model.predict(self.history), np.full(len(self.history), self.units)
+
+
+def backtest(winners, strategy, bankroll=1000.0, unit=10.0):
+    """
+    Plays a betting strategy over many independent sessions at once. Each
+    step settles one hand in every session with NumPy arrays, using the real
+    payouts (Banker 0.95:1, Player 1:1, Tie 8:1, Player/Banker push on a Tie).
+    A session stops betting once its balance is below one unit (ruin), and a
+    stake larger than the balance is cut to the balance.
+
+    Args:
+        winners (np.ndarray): (sessions, hands) outcome codes.
+        strategy: Object with start(num_sessions) and
+            bet(hand, winners, last_net) -> (choices, units) per session, where
+            last_net is the previous hand's net result per unit (None at hand 0).
+        bankroll (float): Starting balance of every session.
+        unit (float): Size of one betting unit.
+
+    Returns:
+        report (dict): RTP, final balance, drawdown and risk-of-ruin statistics.
+        balances (np.ndarray): (sessions, hands + 1) balance trajectories.
+    """
+    winners = np.asarray(winners)
+    num_sessions, hands = winners.shape
+    balances = np.empty((num_sessions, hands + 1))
+    balances[:, 0] = bankroll
+    staked = 0.0
+    net_total = 0.0
+    last_net = None
+
+    strategy.start(num_sessions)
+    for hand in range(hands):
+        balance = balances[:, hand]
+        choices, units = strategy.bet(hand, winners, last_net)
+        stake = np.where(balance >= unit, np.minimum(units * unit, balance), 0.0)
+        last_net = NET_RESULT[choices, winners[:, hand]]
+        net = stake * last_net
+        balances[:, hand + 1] = balance + net
+        staked += stake.sum()
+        net_total += net.sum()
+
+    drawdown = (np.maximum.accumulate(balances, axis=1) - balances).max(axis=1)
+    final = balances[:, -1]
+    report = {
+        'sessions': num_sessions,
+        'hands': hands,
+        'rtp': (staked + net_total) / staked if staked else 1.0,
+        'mean_final_balance': float(final.mean()),
+        'median_final_balance': float(np.median(final)),
+        'mean_max_drawdown': float(drawdown.mean()),
+        'p95_max_drawdown': float(np.percentile(drawdown, 95)),
+        'risk_of_ruin': float((balances.min(axis=1) < unit).mean()),
+    }
+    return report, balances
+
+
+def make_strategy(name):
+    """
+    Args:
+        name (str): 'flat', 'flat_player', 'martingale', 'follow' or 'model'.
+
+    Returns:
+        strategy: The named strategy with default settings.
+    """
+    if name == 'flat':
+        return FlatBet(BANKER)
+    if name == 'flat_player':
+        return FlatBet(PLAYER)
+    if name == 'martingale':
+        return Martingale(BANKER)
+    if name == 'follow':
+        return FollowTheShoe()
+    if name == 'model':
+        from BaccaratModel import MODEL_WEIGHTS, CompiledModel
+        return ModelBet(CompiledModel.load(MODEL_WEIGHTS))
+    raise ValueError(f"Unknown strategy {name!r}.")
+
+
+def main():
+    """Backtests strategies from the command line."""
+    parser = argparse.ArgumentParser(description="Backtest Baccarat betting strategies.")
+    parser.add_argument("--strategies", default="flat,flat_player,martingale,follow,model")
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--hands", type=int, default=200, help="Hands per session")
+    parser.add_argument("--bankroll", type=float, default=1000.0)
+    parser.add_argument("--unit", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--dataset", help="Take outcomes from a BaccaratDataset directory instead of simulating")
+    args = parser.parse_args()
+
+    total = args.sessions * args.hands
+    if args.dataset:
+        from BaccaratDataset import open_dataset
+        _, winners, _ = open_dataset(args.dataset)
+        if len(winners) < total:
+            parser.error(f"Dataset has {len(winners):,} games; {total:,} needed.")
+        winners = winners[:total]
+    else:
+        winners = simulate_many(total, args.seed, NUM_DECKS)['winner']
+    winners = winners.reshape(args.sessions, args.hands)
+    counts = np.bincount(winners.ravel(), minlength=len(OUTCOMES)) / total
+    print("Outcomes: " + ", ".join(f"{name} {p * 100:.2f}%" for name, p in zip(OUTCOMES, counts)))
+
+    print(f"{'Strategy':<13}{'RTP':>9}{'Mean final':>12}{'Mean max DD':>13}{'p95 max DD':>12}{'Ruin':>8}")
+    for name in args.strategies.split(','):
+        report, _ = backtest(winners, make_strategy(name), args.bankroll, args.unit)
+        print(f"{name:<13}{report['rtp'] * 100:>8.2f}%{report['mean_final_balance']:>12.1f}"
+              f"{report['mean_max_drawdown']:>13.1f}{report['p95_max_drawdown']:>12.1f}"
+              f"{report['risk_of_ruin'] * 100:>7.2f}%")
+
+
+if __name__ == "__main__":
+    main()
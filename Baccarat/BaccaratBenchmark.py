@@ -0,0 +1,89 @@
+# BaccaratBenchmark.py
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Stops BaccaratMain.main() at its first input() call, i.e. when the user is
+# first asked for a bet
+_FIRST_PROMPT = (
+    "import builtins\n"
+    "class FirstPrompt(Exception): pass\n"
+    "def stop(prompt=''): raise FirstPrompt\n"
+    "builtins.input = stop\n"
+)
+
+# Each snippet runs in a fresh interpreter, as BaccaratMain does at startup
+STARTUP_CASES = {
+    'BaccaratMain.main() to first prompt': (
+        _FIRST_PROMPT
+        + "import BaccaratMain\n"
+        "try:\n"
+        "    BaccaratMain.main()\n"
+        "except FirstPrompt:\n"
+        "    pass\n"
+    ),
+    'first prompt, odds enumerated': (
+        _FIRST_PROMPT
+        + "import BaccaratMain, BaccaratOdds\n"
+        "BaccaratOdds._load_multisets = lambda filename=None: BaccaratOdds._build_multisets()\n"
+        "try:\n"
+        "    BaccaratMain.main()\n"
+        "except FirstPrompt:\n"
+        "    pass\n"
+    ),
+    'BaccaratMain import + sklearn pickle': (
+        "import warnings; warnings.simplefilter('ignore')\n"
+        "import BaccaratMain, joblib\n"
+        "from BaccaratStrategy import MODEL_PICKLE\n"
+        "joblib.load(MODEL_PICKLE)\n"
+    ),
+    'Python interpreter only': "",
+}
+
+
+def time_startup(code, repeats=5):
+    """
+    Times a snippet in fresh Python processes started in the Baccarat directory.
+
+    Args:
+        code (str): Python source to run.
+        repeats (int): Number of processes to time.
+
+    Returns:
+        seconds (list of float): Wall-clock time of each run.
+    """
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=HERE, check=True, stdout=subprocess.DEVNULL)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def main():
+    """Reports startup time of each case from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark BaccaratMain startup.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    for name, code in STARTUP_CASES.items():
+        seconds = time_startup(code, args.repeats)
+        results[name] = {'min_ms': min(seconds) * 1000, 'median_ms': statistics.median(seconds) * 1000}
+        print(f"{name:<40}min {results[name]['min_ms']:8.1f} ms   median {results[name]['median_ms']:8.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'repeats': args.repeats, 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# BaccaratDataset.py
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from BaccaratLogic import NUM_DECKS, OUTCOMES, PENETRATION, simulate_many
+
+# Version 2 added SHOE_STARTS_FILE; version 1 datasets are still readable
+# but have no shoe boundaries
+FORMAT_VERSION = 2
+READABLE_VERSIONS = (1, 2)
+METADATA_FILE = "metadata.json"
+WINNERS_FILE = "winners.npy"
+CARDS_FILE = "cards.npy"
+SHOE_STARTS_FILE = "shoe_starts.npy"
+
+# Games simulated and written per chunk
+CHUNK_SIZE = 1_000_000
+
+
+def pack_cards(games):
+    """
+    Packs the six card ranks of each game into 3 bytes, one 4-bit rank per card:
+    (player1, player2), (player3, banker1), (banker2, banker3).
+
+    Args:
+        games (np.ndarray): GAME_DTYPE records.
+
+    Returns:
+        packed (np.ndarray): (n, 3) uint8 array.
+    """
+    cards = np.concatenate([games['player_cards'], games['banker_cards']], axis=1)
+    return (cards[:, 0::2] << 4) | cards[:, 1::2]
+
+
+def unpack_cards(packed):
+    """
+    Inverse of pack_cards.
+
+    Args:
+        packed (np.ndarray): (n, 3) uint8 array.
+
+    Returns:
+        player_cards (np.ndarray): (n, 3) Player card ranks (0 = not drawn).
+        banker_cards (np.ndarray): (n, 3) Banker card ranks (0 = not drawn).
+    """
+    cards = np.empty((len(packed), 6), dtype=np.uint8)
+    cards[:, 0::2] = packed >> 4
+    cards[:, 1::2] = packed & 0x0F
+    return cards[:, :3], cards[:, 3:]
+
+
+def write_dataset(path, num_games, seed=None, num_decks=NUM_DECKS, penetration=PENETRATION, chunk_size=CHUNK_SIZE):
+    """
+    Simulates num_games games and writes them to the directory 'path' as
+    .npy files (uint8 winner codes, packed cards and the index of the first
+    game of every shoe) with a JSON metadata header. Games are simulated and
+    written in chunks, so memory use does not grow with num_games. The
+    metadata file is written last and marks the dataset as complete.
+
+    Args:
+        path (str): Dataset directory; created if missing.
+        num_games (int): Number of games to simulate.
+        seed (int, optional): Seed for the simulation.
+        num_decks (int): Decks per shoe; None draws from an infinite deck.
+        penetration (float): Fraction of each shoe dealt before the cut card.
+        chunk_size (int): Games simulated per chunk.
+
+    Returns:
+        metadata (dict): The metadata written alongside the data.
+    """
+    os.makedirs(path, exist_ok=True)
+    metadata_path = os.path.join(path, METADATA_FILE)
+    if os.path.exists(metadata_path):
+        os.remove(metadata_path)
+
+    rng = np.random.default_rng(seed)
+    winners = open_memmap(os.path.join(path, WINNERS_FILE), mode='w+', dtype=np.uint8, shape=(num_games,))
+    cards = open_memmap(os.path.join(path, CARDS_FILE), mode='w+', dtype=np.uint8, shape=(num_games, 3))
+    shoe_starts = []
+    for start in range(0, num_games, chunk_size):
+        games = simulate_many(min(chunk_size, num_games - start), rng, num_decks, penetration)
+        winners[start:start + len(games)] = games['winner']
+        cards[start:start + len(games)] = pack_cards(games)
+        # Every chunk starts a fresh shoe
+        shoe_starts.append(start + np.concatenate([[0], np.flatnonzero(np.diff(games['shoe'])) + 1]))
+    winners.flush()
+    cards.flush()
+    del winners, cards
+    shoe_starts = np.concatenate(shoe_starts).astype(np.int64)
+    np.save(os.path.join(path, SHOE_STARTS_FILE), shoe_starts)
+
+    metadata = {
+        'format_version': FORMAT_VERSION,
+        'games': num_games,
+        'shoes': len(shoe_starts),
+        'outcomes': list(OUTCOMES),
+        'num_decks': num_decks,
+        'penetration': penetration,
+        'seed': seed,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    with open(metadata_path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return metadata
+
+
+def open_dataset(path):
+    """
+    Memory-maps a dataset written by write_dataset. Nothing is read until the
+    arrays are accessed, and processes mapping the same files share pages.
+
+    Args:
+        path (str): Dataset directory.
+
+    Returns:
+        metadata (dict): Dataset metadata.
+        winners (np.memmap): Read-only (n,) uint8 outcome codes.
+        cards (np.memmap): Read-only (n, 3) packed cards (see unpack_cards).
+    """
+    metadata_path = os.path.join(path, METADATA_FILE)
+    if not os.path.exists(metadata_path):
+        raise FileNotFoundError(f"No complete Baccarat dataset at {path!r}.")
+    with open(metadata_path) as f:
+        metadata = json.load(f)
+    if metadata['format_version'] not in READABLE_VERSIONS:
+        raise ValueError(f"Unsupported dataset format version {metadata['format_version']}.")
+
+    winners = np.load(os.path.join(path, WINNERS_FILE), mmap_mode='r')
+    cards = np.load(os.path.join(path, CARDS_FILE), mmap_mode='r')
+    return metadata, winners, cards
+
+
+def load_shoe_starts(path):
+    """
+    Args:
+        path (str): Dataset directory.
+
+    Returns:
+        shoe_starts (np.ndarray): Index of the first game of every shoe, ascending.
+    """
+    shoe_starts_path = os.path.join(path, SHOE_STARTS_FILE)
+    if not os.path.exists(shoe_starts_path):
+        raise FileNotFoundError(f"Dataset at {path!r} has no shoe boundaries (format version 1); "
+                                f"write it again with BaccaratDataset.py.")
+    return np.load(shoe_starts_path)
+
+
+def iter_chunks(array, chunk_size=CHUNK_SIZE, start=0, stop=None):
+    """
+    Yields consecutive zero-copy slices of a (memory-mapped) array.
+
+    Args:
+        array (np.ndarray): Array to slice, e.g. the winners of open_dataset.
+        chunk_size (int): Rows per slice.
+        start (int): First row.
+        stop (int, optional): End row (default: the end of the array).
+
+    Yields:
+        chunk (np.ndarray): A view of up to chunk_size rows.
+    """
+    stop = len(array) if stop is None else min(stop, len(array))
+    for i in range(start, stop, chunk_size):
+        yield array[i:min(i + chunk_size, stop)]
+
+
+def main():
+    """Writes a simulated dataset from the command line."""
+    parser = argparse.ArgumentParser(description="Simulate Baccarat games into a memory-mapped dataset.")
+    parser.add_argument("path", help="Dataset directory")
+    parser.add_argument("--games", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--decks", type=int, default=NUM_DECKS, help="Decks per shoe (0 = infinite deck)")
+    parser.add_argument("--penetration", type=float, default=PENETRATION)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    metadata = write_dataset(args.path, args.games, args.seed, args.decks or None, args.penetration)
+    print(f"Wrote {metadata['games']:,} games to {args.path} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,115 @@
 
 import numpy as np
 
+# Outcome codes, in LabelEncoder order (classes are sorted alphabetically)
+OUTCOMES = ('Banker', 'Player', 'Tie')
+BANKER, PLAYER, TIE = 0, 1, 2
 
-def play_baccarat():
+# Highest Banker total that still draws, indexed by the Player's third card
+BANKER_DRAW_LIMIT = np.array([3, 3, 4, 4, 5, 5, 6, 6, 2, 3])
+
+# Cards are ranks 1-13 (Ace=1, Jack/Queen/King=11-13); 0 means no card.
+# Tens and face cards count as 0 towards a hand's total.
+CARD_VALUE = np.array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 0, 0, 0, 0], dtype=np.uint8)
+RANK_NAMES = ('', 'A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K')
+
+# Default shoe: 8 decks with the cut card placed one deck from the end
+NUM_DECKS = 8
+PENETRATION = 0.875
+
+# One simulated game per record; a card of 0 means it was not drawn.
+# shoe numbers the shoe a game was dealt from (always 0 for an infinite deck).
+GAME_DTYPE = np.dtype([
+    ('player_cards', np.uint8, (3,)),
+    ('banker_cards', np.uint8, (3,)),
+    ('player_score', np.uint8),
+    ('banker_score', np.uint8),
+    ('winner', np.uint8),
+    ('shoe', np.uint32),
+])
+
+
+class Shoe:
+    """
+    A finite multi-deck shoe backed by a NumPy array of card ranks.
+    Dealing advances a cursor instead of removing cards, and the shoe
+    reshuffles before the first game after the cut card comes out.
+
+    Args:
+        num_decks (int): Number of 52-card decks in the shoe.
+        penetration (float): Fraction of the shoe dealt before the cut card.
+        rng (np.random.Generator or int, optional): Random generator or seed.
+    """
+
+    def __init__(self, num_decks=NUM_DECKS, penetration=PENETRATION, rng=None):
+        self.num_decks = num_decks
+        self.penetration = penetration
+        self.rng = np.random.default_rng(rng)
+        self.cards = np.tile(np.repeat(np.arange(1, 14, dtype=np.uint8), 4), num_decks)
+        # A game needs at most 6 cards, so the cut card never leaves fewer
+        self.cut_card = min(int(len(self.cards) * penetration), len(self.cards) - 6)
+        self.shoe_number = -1
+        self.shuffle()
+
+    def shuffle(self):
+        """Shuffles every card back into the shoe."""
+        self.rng.shuffle(self.cards)
+        self.position = 0
+        self.counts = np.bincount(CARD_VALUE[self.cards], minlength=10)
+        self.shoe_number += 1
+
+    @property
+    def remaining(self):
+        """Number of cards left in the shoe."""
+        return len(self.cards) - self.position
+
+    @property
+    def needs_shuffle(self):
+        """True once the cut card has come out."""
+        return self.position >= self.cut_card
+
+    def composition(self):
+        """
+        Returns:
+            counts (np.ndarray): Undealt cards per Baccarat value 0-9.
+        """
+        return self.counts.copy()
+
+    def deal(self, k=1):
+        """
+        Deals k cards from the front of the shoe.
+
+        Returns:
+            cards (np.ndarray): The ranks of the dealt cards.
+        """
+        cards = self.cards[self.position:self.position + k]
+        self.position += len(cards)
+        self.counts -= np.bincount(CARD_VALUE[cards], minlength=10)
+        return cards
+
+    def play_game(self):
+        """
+        Plays one game from the shoe, reshuffling first if the cut card is out.
+
+        Returns:
+            game (np.void): A GAME_DTYPE record.
+        """
+        if self.needs_shuffle:
+            self.shuffle()
+        games, used = resolve_games(self.cards[None, self.position:self.position + 6])
+        self.deal(int(used[0]))
+        games['shoe'] = self.shoe_number
+        return games[0]
+
+
+def play_baccarat(shoe=None):
     """
     Simulates a single game of Baccarat following official rules.
 
+    Args:
+        shoe (Shoe, optional): Deal from this shoe. By default every card is
+            drawn independently from 1 to 9.
+
     Returns:
         player_score (int): Player's total score.
         banker_score (int): Banker's total score.
@@ -18,6 +122,13 @@ def play_baccarat():
         banker_card2 (int): Banker's second card.
         banker_card3 (int): Banker's third card (0 if not drawn).
     """
+    if shoe is not None:
+        game = shoe.play_game()
+        player_card1, player_card2, player_card3 = (int(c) for c in game['player_cards'])
+        banker_card1, banker_card2, banker_card3 = (int(c) for c in game['banker_cards'])
+        return (int(game['player_score']), int(game['banker_score']), OUTCOMES[game['winner']],
+                player_card1, player_card2, player_card3, banker_card1, banker_card2, banker_card3)
+
     # Generate random cards between 1 and 9 for Player and Banker
     player_card1, player_card2 = np.random.randint(1, 10, size=2)
     banker_card1, banker_card2 = np.random.randint(1, 10, size=2)
@@ -50,7 +161,11 @@ def play_baccarat():
 
     # Determine if Banker draws a third card based on Player's third card
     if player_draw:
-        if player_card3 in [0, 1, 2, 3]:
+        if player_card3 in [0, 1]:
+            if banker_score <= 3:
+                banker_card3 = np.random.randint(1, 10)
+                banker_score = (banker_score + banker_card3) % 10
+        elif player_card3 in [2, 3]:
             if banker_score <= 4:
                 banker_card3 = np.random.randint(1, 10)
                 banker_score = (banker_score + banker_card3) % 10
@@ -85,3 +200,117 @@ def play_baccarat():
         winner = 'Tie'
 
     return player_score, banker_score, winner, player_card1, player_card2, player_card3, banker_card1, banker_card2, banker_card3
+
+
+def resolve_games(cards):
+    """
+    Plays one game per row with masked NumPy operations.
+
+    Args:
+        cards (np.ndarray): (n, 6) card ranks in dealing order: Player, Banker,
+            Player, Banker, then the next two cards for any third-card draws.
+
+    Returns:
+        games (np.ndarray): Structured array of GAME_DTYPE records.
+        used (np.ndarray): Cards each game took from its row (4 to 6).
+    """
+    player_card1, banker_card1, player_card2, banker_card2, next1, next2 = cards.T
+
+    player_score = (CARD_VALUE[player_card1] + CARD_VALUE[player_card2]) % 10
+    banker_score = (CARD_VALUE[banker_card1] + CARD_VALUE[banker_card2]) % 10
+    natural = (player_score >= 8) | (banker_score >= 8)
+
+    # Player draws on 0-5 unless either side has a natural
+    player_draws = ~natural & (player_score <= 5)
+    player_card3 = np.where(player_draws, next1, 0)
+    player_value3 = CARD_VALUE[player_card3]
+    player_score = (player_score + player_value3) % 10
+
+    # Banker draws on 0-5 when the Player stood, otherwise by the tableau
+    banker_limit = np.where(player_draws, BANKER_DRAW_LIMIT[player_value3], 5)
+    banker_draws = ~natural & (banker_score <= banker_limit)
+    banker_card3 = np.where(banker_draws, np.where(player_draws, next2, next1), 0)
+    banker_score = (banker_score + CARD_VALUE[banker_card3]) % 10
+
+    games = np.zeros(len(cards), dtype=GAME_DTYPE)
+    games['player_cards'] = np.stack([player_card1, player_card2, player_card3], axis=1)
+    games['banker_cards'] = np.stack([banker_card1, banker_card2, banker_card3], axis=1)
+    games['player_score'] = player_score
+    games['banker_score'] = banker_score
+    games['winner'] = np.where(player_score > banker_score, PLAYER,
+                               np.where(banker_score > player_score, BANKER, TIE))
+    return games, 4 + player_draws + banker_draws
+
+
+def simulate_shoes(num_shoes, num_decks=NUM_DECKS, penetration=PENETRATION, rng=None):
+    """
+    Deals num_shoes independently shuffled shoes down to the cut card. The
+    shoes are played side by side, one game from every unfinished shoe per
+    step, so the work is vectorized across shoes.
+
+    Args:
+        num_shoes (int): Number of shoes to play.
+        num_decks (int): Number of decks per shoe.
+        penetration (float): Fraction of each shoe dealt before the cut card.
+        rng (np.random.Generator or int, optional): Random generator or seed.
+
+    Returns:
+        games (np.ndarray): Structured array of GAME_DTYPE records in dealing
+            order, shoe after shoe; the shoe field runs from 0 to num_shoes - 1.
+    """
+    rng = np.random.default_rng(rng)
+    deck = np.repeat(np.arange(1, 14, dtype=np.uint8), 4)
+    shoes = rng.permuted(np.tile(deck, (num_shoes, num_decks)), axis=1)
+    size = shoes.shape[1]
+    cut_card = min(int(size * penetration), size - 6)
+
+    position = np.zeros(num_shoes, dtype=np.intp)
+    rows = np.arange(num_shoes)
+    steps = []
+    while True:
+        active = rows[position < cut_card]
+        if len(active) == 0:
+            break
+        games, used = resolve_games(shoes[active[:, None], position[active, None] + np.arange(6)])
+        games['shoe'] = active
+        position[active] += used
+        steps.append(games)
+
+    games = np.concatenate(steps)
+    # A stable sort keeps each shoe's games in dealing order
+    return games[np.argsort(games['shoe'], kind='stable')]
+
+
+def simulate_many(n, rng=None, num_decks=None, penetration=PENETRATION):
+    """
+    Simulates n games of Baccarat at once with the same drawing rules as
+    play_baccarat, using masked NumPy operations instead of a loop.
+
+    Args:
+        n (int): Number of games to simulate.
+        rng (np.random.Generator or int, optional): Random generator or seed.
+        num_decks (int, optional): Deal from num_decks-deck shoes, shoe after
+            shoe. By default every card is drawn independently from 1 to 9.
+        penetration (float): Fraction of each shoe dealt before the cut card.
+
+    Returns:
+        games (np.ndarray): Structured array of GAME_DTYPE records. Card fields
+            hold ranks (0 for a third card that was not drawn) and winner holds
+            an index into OUTCOMES.
+    """
+    rng = np.random.default_rng(rng)
+    if num_decks is None:
+        games, _ = resolve_games(rng.integers(1, 10, size=(n, 6), dtype=np.uint8))
+        return games
+
+    # A game uses about 4.94 cards on average
+    per_shoe = max(1, int(num_decks * 52 * penetration / 5))
+    batches = []
+    total = 0
+    while total < n:
+        games = simulate_shoes(-(-(n - total) // per_shoe), num_decks, penetration, rng)
+        if batches:
+            games['shoe'] += batches[-1]['shoe'][-1] + 1
+        batches.append(games)
+        total += len(games)
+    return np.concatenate(batches)[:n]
@@ -1,25 +1,46 @@
 # BaccaratMain.py
 
-from BaccaratLogic import play_baccarat
-from BaccaratStrategy import train_model
-import joblib
+import threading
+
+from BaccaratLogic import OUTCOMES, RANK_NAMES, Shoe, play_baccarat
+from BaccaratModel import MODEL_WEIGHTS, CompiledModel
+from BaccaratOdds import NET_RESULT, house_edge, outcome_probabilities
+from BaccaratStats import ShoeStats, render_big_road
 import numpy as np
 
 
-def load_model(filename="baccarat_model_with_history.pkl"):
+def load_model(filename=MODEL_WEIGHTS):
     """
-    Loads the trained model, scaler, and label encoder.
+    Loads the compiled model from its NumPy weight file, without sklearn.
 
     Args:
-        filename (str): Path to the saved model file.
+        filename (str): Path to the saved .npz weight file.
+
+    Returns:
+        model (CompiledModel): Compiled outcome model.
+    """
+    return CompiledModel.load(filename)
+
+
+def train_in_background():
+    """
+    Trains a new model in a daemon thread so the game is playable meanwhile.
+    sklearn is only imported inside the thread.
 
     Returns:
-        model (MLPClassifier): Trained machine learning model.
-        scaler (StandardScaler): Fitted scaler for feature normalization.
-        label_encoder (LabelEncoder): Fitted label encoder.
+        trainer (dict): 'model' is None until training finishes, then holds
+            the CompiledModel.
     """
-    data = joblib.load(filename)
-    return data['model'], data['scaler'], data['label_encoder']
+    trainer = {'model': None}
+
+    def train():
+        from BaccaratStrategy import train_model
+        model = CompiledModel.from_sklearn(*train_model())
+        trainer['model'] = model
+        print("\n[Model training complete. Suggestions are now available.]")
+
+    threading.Thread(target=train, daemon=True).start()
+    return trainer
 
 
 def get_user_bet():
@@ -42,18 +63,18 @@ def get_bet_amount(current_balance):
     Prompts the user to enter a bet amount.
 
     Args:
-        current_balance (int): User's current balance.
+        current_balance (float): User's current balance.
 
     Returns:
         bet_amount (int): Amount the user wants to bet.
     """
     while True:
         try:
-            amount = int(input(f"Enter bet amount (Available balance: {current_balance}): "))
+            amount = int(input(f"Enter bet amount (Available balance: {current_balance:,.2f}): "))
             if 1 <= amount <= current_balance:
                 return amount
             else:
-                print(f"Please enter a valid amount between 1 and {current_balance}.")
+                print(f"Please enter a valid amount between 1 and {int(current_balance)}.")
         except ValueError:
             print("Invalid input. Please enter a numerical value.")
 
@@ -70,54 +91,89 @@ def display_history(history):
     print("-----------------------------")
 
 
+def display_odds(shoe):
+    """
+    Displays the exact outcome probabilities and house edge of each bet for
+    the next game, given the cards left in the shoe.
+
+    Args:
+        shoe (Shoe): Shoe the next game is dealt from.
+    """
+    composition = shoe.composition()
+    probabilities = outcome_probabilities(composition)
+    edges = house_edge(composition)
+    print(f"\n--- Next Game Odds ({shoe.remaining} cards left, standard payouts) ---")
+    for outcome in ['Player', 'Banker', 'Tie']:
+        print(f"{outcome:<7} {probabilities[outcome] * 100:6.2f}%   house edge {edges[outcome] * 100:6.2f}%")
+    print("-----------------------------")
+
+
+def display_shoe_stats(stats):
+    """
+    Displays the big road and running statistics of the current shoe.
+
+    Args:
+        stats (ShoeStats): Statistics of the current shoe.
+    """
+    summary = stats.summary()
+    print(f"\n--- Big Road (hand {summary['hands']}) ---")
+    print(render_big_road(stats))
+    outcome, length = summary['streak']
+    counts = summary['outcomes']
+    line = f"Banker {counts['Banker']} | Player {counts['Player']} | Tie {counts['Tie']}"
+    if outcome:
+        line += f" | Streak: {outcome} x{length}"
+    print(line)
+    print(f"Pairs: Player {stats.player_pairs}, Banker {stats.banker_pairs}"
+          f" | Naturals: Player {stats.player_naturals}, Banker {stats.banker_naturals}")
+    print("-----------------------------")
+
+
 def display_cards(player_card1, player_card2, player_card3, banker_card1, banker_card2, banker_card3):
     """
     Displays the cards for both Player and Banker.
 
     Args:
-        player_card1 (int): Player's first card.
-        player_card2 (int): Player's second card.
-        player_card3 (int): Player's third card (0 if not drawn).
-        banker_card1 (int): Banker's first card.
-        banker_card2 (int): Banker's second card.
-        banker_card3 (int): Banker's third card (0 if not drawn).
+        player_card1 (int): Player's first card rank.
+        player_card2 (int): Player's second card rank.
+        player_card3 (int): Player's third card rank (0 if not drawn).
+        banker_card1 (int): Banker's first card rank.
+        banker_card2 (int): Banker's second card rank.
+        banker_card3 (int): Banker's third card rank (0 if not drawn).
     """
     print("\n--- Current Game Cards ---")
 
     # Display Player's Cards
-    if player_card3 != 0:
-        print(f"Player's Cards: {player_card1}, {player_card2}, {player_card3}")
-    else:
-        print(f"Player's Cards: {player_card1}, {player_card2}")
+    player_cards = [player_card1, player_card2, player_card3]
+    print("Player's Cards: " + ", ".join(RANK_NAMES[c] for c in player_cards if c != 0))
 
     # Display Banker's Cards
-    if banker_card3 != 0:
-        print(f"Banker's Cards: {banker_card1}, {banker_card2}, {banker_card3}")
-    else:
-        print(f"Banker's Cards: {banker_card1}, {banker_card2}")
+    banker_cards = [banker_card1, banker_card2, banker_card3]
+    print("Banker's Cards: " + ", ".join(RANK_NAMES[c] for c in banker_cards if c != 0))
 
     print("----------------------------")
 
 
-def simulate_game(user_bet_choice, bet_amount, model, scaler, label_encoder, history):
+def simulate_game(user_bet_choice, bet_amount, model, history, shoe=None, stats=None):
     """
     Simulates a single game of Baccarat.
 
     Args:
         user_bet_choice (str): User's bet choice.
         bet_amount (int): Amount the user wants to bet.
-        model (MLPClassifier): Trained machine learning model.
-        scaler (StandardScaler): Fitted scaler for feature normalization.
-        label_encoder (LabelEncoder): Fitted label encoder.
+        model (CompiledModel): Compiled outcome model, or None while it is still training.
         history (list): List of past game outcomes.
+        shoe (Shoe, optional): Shoe to deal from.
+        stats (ShoeStats, optional): Shoe statistics to update with the game.
 
     Returns:
         outcome (str): Outcome of the current game ('Player', 'Banker', 'Tie').
-        result (str): 'win' if user won, 'lose' otherwise.
+        net (float): Amount won (positive), lost (negative) or 0 for a push,
+            paying Banker 0.95:1, Player 1:1 and Tie 8:1.
         history (list): Updated list of past game outcomes.
     """
     # Simulate a game
-    player_score, banker_score, winner, player_card1, player_card2, player_card3, banker_card1, banker_card2, banker_card3 = play_baccarat()
+    player_score, banker_score, winner, player_card1, player_card2, player_card3, banker_card1, banker_card2, banker_card3 = play_baccarat(shoe)
 
     # Update history
     history.append(winner)
@@ -129,30 +185,31 @@ def simulate_game(user_bet_choice, bet_amount, model, scaler, label_encoder, his
     display_history(history)
     print(f"Features for prediction: {features}")
 
-    # Encode features
-    encoded_features = label_encoder.transform(features)
-    encoded_features = encoded_features.reshape(1, -1)  # Reshape for scaler
-
-    # Scale features
-    scaled_features = scaler.transform(encoded_features)
-
-    # Model suggestion
-    prediction = model.predict(scaled_features)[0]
-    suggestion = label_encoder.inverse_transform([prediction])[0]
-    print(f"[Model Suggestion] It is recommended to bet on: {suggestion}")
+    # Model suggestion, looked up from the compiled model's table of every history
+    if model is None:
+        print("[Model Suggestion] The model is still training.")
+    else:
+        suggestion = model.suggest(features)
+        print(f"[Model Suggestion] It is recommended to bet on: {suggestion}")
 
     # Display the cards for both Player and Banker
     display_cards(player_card1, player_card2, player_card3, banker_card1, banker_card2, banker_card3)
 
-    # Determine if user's bet was correct
-    if user_bet_choice == winner:
-        print(f"Congratulations! You won {bet_amount}.")
-        result = 'win'
+    if stats is not None:
+        stats.update(OUTCOMES.index(winner), [player_card1, player_card2, player_card3],
+                     [banker_card1, banker_card2, banker_card3])
+        display_shoe_stats(stats)
+
+    # Settle the bet; Player and Banker bets push on a Tie
+    net = bet_amount * float(NET_RESULT[OUTCOMES.index(user_bet_choice), OUTCOMES.index(winner)])
+    if net > 0:
+        print(f"Congratulations! You won {net:,.2f}.")
+    elif net < 0:
+        print(f"Sorry, you lost {-net:,.2f}.")
     else:
-        print(f"Sorry, you lost {bet_amount}.")
-        result = 'lose'
+        print("It's a Tie. Your bet is returned.")
 
-    return winner, result, history
+    return winner, net, history
 
 
 def main():
@@ -162,12 +219,11 @@ def main():
     # Attempt to load the trained model
     print("Loading trained model...")
     try:
-        model, scaler, label_encoder = load_model()
+        trainer = {'model': load_model()}
     except FileNotFoundError:
-        print("Model file 'baccarat_model_with_history.pkl' not found.")
-        print("Training the model now...")
-        model, scaler, label_encoder = train_model()
-        print("Model training complete.")
+        print(f"Model file '{MODEL_WEIGHTS}' not found.")
+        print("Training the model in the background; you can start playing now.")
+        trainer = train_in_background()
 
     # Initialize user balance
     user_balance = 1000  # Starting balance
@@ -175,27 +231,33 @@ def main():
     # Initialize history with 'Tie' to handle initial games
     history = ['Tie'] * 3
 
+    # Deal from an 8-deck shoe that is reshuffled when the cut card comes out
+    shoe = Shoe()
+    stats = ShoeStats(shoe.num_decks)
+
     while True:
-        print(f"\nCurrent Balance: {user_balance}")
+        print(f"\nCurrent Balance: {user_balance:,.2f}")
+        if shoe.needs_shuffle:
+            print("Cut card reached. Shuffling a new shoe...")
+            shoe.shuffle()
+            stats.new_shoe()
+        display_odds(shoe)
 
         # Get user bet
         bet_choice = get_user_bet()
         bet_amount = get_bet_amount(user_balance)
 
         # Simulate game and get outcome
-        outcome, result, history = simulate_game(bet_choice, bet_amount, model, scaler, label_encoder, history)
+        outcome, net, history = simulate_game(bet_choice, bet_amount, trainer['model'], history, shoe, stats)
 
         # Update user balance
-        if result == 'win':
-            user_balance += bet_amount
-        else:
-            user_balance -= bet_amount
+        user_balance += net
 
         print(f"Game Outcome: {outcome}")
-        print(f"Updated Balance: {user_balance}")
+        print(f"Updated Balance: {user_balance:,.2f}")
 
         # Check if user wants to continue
-        if user_balance <= 0:
+        if user_balance < 1:
             print("You've run out of balance! Game over.")
             break
 
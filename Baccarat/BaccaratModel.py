@@ -0,0 +1,146 @@
+# BaccaratModel.py
+
+from itertools import product
+
+import numpy as np
+
+# NumPy-only weights, loadable without importing sklearn
+MODEL_WEIGHTS = "baccarat_model_with_history.npz"
+
+ACTIVATIONS = {
+    'identity': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'tanh': np.tanh,
+    'logistic': lambda x: 1 / (1 + np.exp(-x)),
+}
+
+
+class CompiledModel:
+    """
+    NumPy-only inference for the trained outcome model. The label encoder and
+    scaler are folded into the first layer: for history position j and outcome
+    c, first_layer[j, c] holds that input's contribution to the first hidden
+    layer, so a forward pass is a row lookup and sum followed by plain matmuls.
+    Suggestions for every possible history are precomputed into a dict.
+
+    Args:
+        first_layer (np.ndarray): (history_length, num_classes, hidden) input contributions.
+        first_bias (np.ndarray): (hidden,) first hidden layer bias.
+        weights (list of np.ndarray): Weight matrices of the remaining layers.
+        biases (list of np.ndarray): Bias vectors of the remaining layers.
+        classes (sequence of str): Outcome names, indexed by outcome code.
+        output_codes (sequence of int, optional): Outcome code of each output
+            unit (default: one unit per outcome, in code order).
+        activation (str): Hidden layer activation, as named by sklearn.
+    """
+
+    def __init__(self, first_layer, first_bias, weights, biases, classes, output_codes=None, activation='relu'):
+        self.first_layer = first_layer
+        self.first_bias = first_bias
+        self.weights = weights
+        self.biases = biases
+        self.classes = tuple(classes)
+        self.output_codes = np.arange(len(self.classes)) if output_codes is None else np.asarray(output_codes)
+        self.activation = activation
+        self._activate = ACTIVATIONS[activation]
+        self.codes = {name: code for code, name in enumerate(self.classes)}
+        self.history_length = first_layer.shape[0]
+
+        histories = np.array(list(product(range(len(self.classes)), repeat=self.history_length)))
+        predictions = self.predict(histories)
+        self.table = {
+            tuple(self.classes[c] for c in history): self.classes[p]
+            for history, p in zip(histories, predictions)
+        }
+
+    @classmethod
+    def from_sklearn(cls, model, scaler, label_encoder):
+        """
+        Compiles a fitted MLPClassifier with the scaler and label encoder it was trained with.
+
+        Args:
+            model (MLPClassifier): Trained machine learning model.
+            scaler (StandardScaler): Fitted scaler for feature normalization.
+            label_encoder (LabelEncoder): Fitted label encoder.
+
+        Returns:
+            compiled (CompiledModel): Equivalent NumPy-only model.
+        """
+        # (code - mean) / scale @ W + b  ==  code * (W / scale) + (b - (mean / scale) @ W)
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(len(scaler.mean_))
+        w = model.coefs_[0] / scale[:, None]
+        first_bias = model.intercepts_[0] - (scaler.mean_ / scale) @ model.coefs_[0]
+        codes = np.arange(len(label_encoder.classes_), dtype=np.float64)
+        first_layer = codes[None, :, None] * w[:, None, :]
+        return cls(first_layer, first_bias, list(model.coefs_[1:]), list(model.intercepts_[1:]),
+                   [str(c) for c in label_encoder.classes_], model.classes_, model.activation)
+
+    def save(self, filename):
+        """
+        Saves the weights to a NumPy .npz file that load() reads back without sklearn.
+
+        Args:
+            filename (str): Path of the .npz file.
+        """
+        arrays = {'first_layer': self.first_layer, 'first_bias': self.first_bias,
+                  'classes': np.array(self.classes), 'output_codes': self.output_codes,
+                  'activation': np.array(self.activation)}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f'weight_{i}'] = w
+            arrays[f'bias_{i}'] = b
+        with open(filename, 'wb') as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Args:
+            filename (str): Path of a .npz file written by save().
+
+        Returns:
+            compiled (CompiledModel): The loaded model.
+        """
+        with np.load(filename) as data:
+            layers = sum(1 for name in data.files if name.startswith('weight_'))
+            return cls(data['first_layer'], data['first_bias'],
+                       [data[f'weight_{i}'] for i in range(layers)], [data[f'bias_{i}'] for i in range(layers)],
+                       [str(c) for c in data['classes']], data['output_codes'], str(data['activation']))
+
+    def predict_proba(self, histories):
+        """
+        Args:
+            histories (np.ndarray): (n, history_length) outcome codes.
+
+        Returns:
+            probabilities (np.ndarray): (n, outputs) probability per output
+                unit, i.e. of the outcome codes in output_codes.
+        """
+        histories = np.asarray(histories)
+        x = self.first_layer[np.arange(self.history_length), histories].sum(axis=1) + self.first_bias
+        for w, b in zip(self.weights, self.biases):
+            x = self._activate(x) @ w + b
+        if x.shape[1] == 1:
+            p = 1 / (1 + np.exp(-x))
+            return np.hstack([1 - p, p])
+        x = np.exp(x - x.max(axis=1, keepdims=True))
+        return x / x.sum(axis=1, keepdims=True)
+
+    def predict(self, histories):
+        """
+        Args:
+            histories (np.ndarray): (n, history_length) outcome codes.
+
+        Returns:
+            predictions (np.ndarray): (n,) predicted outcome codes.
+        """
+        return self.output_codes[self.predict_proba(histories).argmax(axis=1)]
+
+    def suggest(self, history):
+        """
+        Args:
+            history (sequence of str): The last history_length outcomes, oldest first.
+
+        Returns:
+            suggestion (str): The predicted next outcome.
+        """
+        return self.table[tuple(history)]
@@ -0,0 +1,168 @@
+# BaccaratOdds.py
+
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from BaccaratLogic import OUTCOMES, resolve_games
+
+# Net win per unit staked on each bet; Player and Banker bets push on a Tie
+PAYOUTS = {'Banker': 0.95, 'Player': 1.0, 'Tie': 8.0}
+
+# NET_RESULT[bet, winner]: net result per unit staked, rows and columns in OUTCOMES order
+NET_RESULT = np.array([
+    [PAYOUTS['Banker'], -1.0, 0.0],
+    [-1.0, PAYOUTS['Player'], 0.0],
+    [-1.0, -1.0, PAYOUTS['Tie']],
+])
+
+# Most cards a single game can use
+MAX_CARDS = 6
+
+# Precomputed _build_multisets() result, so the first odds need no enumeration
+MULTISETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baccarat_multisets.npz")
+
+_multisets = None
+
+
+def _build_multisets():
+    """
+    Enumerates every way a game can be dealt, by card value, and groups the
+    deals by the multiset of values they use. The probability of an ordered
+    deal depends only on that multiset, so per composition only these groups
+    need to be weighted.
+
+    Returns:
+        multiplicities (np.ndarray): (m, 10) count of each value per multiset.
+        outcomes (np.ndarray): (m, 3) ordered deals per multiset that end in
+            each outcome, indexed like OUTCOMES.
+    """
+    values = np.indices((10,) * MAX_CARDS).reshape(MAX_CARDS, -1).T.astype(np.uint8)
+    # Value 0 is dealt as a ten
+    games, used = resolve_games(np.where(values == 0, 10, values).astype(np.uint8))
+
+    # Keep each deal once: the sequence whose unused trailing cards are all 0
+    positions = np.arange(MAX_CARDS)
+    unused = positions >= used[:, None]
+    keep = ~np.any(unused & (values != 0), axis=1)
+    values, winners, unused = values[keep], games['winner'][keep], unused[keep]
+
+    counts = np.zeros((len(values), 10), dtype=np.int64)
+    np.add.at(counts, (np.repeat(np.arange(len(values)), MAX_CARDS), values.ravel()), ~unused.ravel())
+    keys = counts @ (MAX_CARDS + 1) ** np.arange(10)
+    keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+    outcomes = np.zeros((len(keys), 3), dtype=np.int64)
+    np.add.at(outcomes, (inverse.ravel(), winners), 1)
+    return counts[first], outcomes
+
+
+def save_multisets(filename=MULTISETS_FILE):
+    """
+    Enumerates the deal multisets and saves them for _load_multisets().
+
+    Args:
+        filename (str): Path of the .npz file.
+    """
+    multiplicities, outcomes = _build_multisets()
+    with open(filename, 'wb') as f:
+        np.savez_compressed(f, multiplicities=multiplicities.astype(np.uint8), outcomes=outcomes.astype(np.uint16))
+
+
+def _load_multisets(filename=MULTISETS_FILE):
+    """
+    Returns the deal multisets from MULTISETS_FILE, or enumerates them (about
+    half a second) if the file is missing.
+    """
+    try:
+        with np.load(filename) as data:
+            return data['multiplicities'].astype(np.int64), data['outcomes'].astype(np.int64)
+    except FileNotFoundError:
+        return _build_multisets()
+
+
+@lru_cache(maxsize=4096)
+def _probabilities(composition):
+    global _multisets
+    if _multisets is None:
+        _multisets = _load_multisets()
+    multiplicities, outcomes = _multisets
+
+    counts = np.array(composition, dtype=np.float64)
+    total = counts.sum()
+    # falling[v, m] = counts[v] * (counts[v] - 1) * ... over m factors
+    steps = np.clip(counts[:, None] - np.arange(MAX_CARDS), 0, None)
+    falling = np.hstack([np.ones((10, 1)), np.cumprod(steps, axis=1)])
+    total_falling = np.concatenate([[1.0], np.cumprod(total - np.arange(MAX_CARDS))])
+
+    weights = falling[np.arange(10), multiplicities].prod(axis=1)
+    weights /= total_falling[multiplicities.sum(axis=1)]
+    probabilities = weights @ outcomes
+    return tuple(float(p) for p in probabilities)
+
+
+def outcome_probabilities(composition):
+    """
+    Exact probabilities of each outcome of the next game dealt from a shoe,
+    found by enumerating every draw sequence under the third-card rules.
+    Results are memoized on the composition.
+
+    Args:
+        composition (sequence of int): Undealt cards per value 0-9, as returned
+            by Shoe.composition(). Must hold at least 6 cards.
+
+    Returns:
+        probabilities (dict): Probability of 'Banker', 'Player' and 'Tie'.
+    """
+    composition = tuple(int(c) for c in composition)
+    if len(composition) != 10 or min(composition) < 0:
+        raise ValueError("Composition must be 10 non-negative counts, one per card value 0-9.")
+    if sum(composition) < MAX_CARDS:
+        raise ValueError(f"A game needs at least {MAX_CARDS} cards in the shoe.")
+    probabilities = _probabilities(composition)
+    return {name: probabilities[code] for code, name in enumerate(OUTCOMES)}
+
+
+def return_to_player(bets, winners):
+    """
+    Return to player of one unit staked on each game, with the payouts in
+    PAYOUTS.
+
+    Args:
+        bets (np.ndarray): Outcome code bet on in each game.
+        winners (np.ndarray): Outcome code of each game.
+
+    Returns:
+        rtp (float): Amount returned per unit staked (1.0 = break even).
+    """
+    return 1.0 + float(NET_RESULT[bets, winners].mean())
+
+
+def house_edge(composition):
+    """
+    House edge of each bet on the next game, as a fraction of the amount
+    staked, with the payouts in PAYOUTS.
+
+    Args:
+        composition (sequence of int): Undealt cards per value 0-9.
+
+    Returns:
+        edges (dict): House edge of the 'Banker', 'Player' and 'Tie' bets.
+    """
+    p = outcome_probabilities(composition)
+    return {
+        'Banker': p['Player'] - PAYOUTS['Banker'] * p['Banker'],
+        'Player': p['Banker'] - PAYOUTS['Player'] * p['Player'],
+        'Tie': p['Banker'] + p['Player'] - PAYOUTS['Tie'] * p['Tie'],
+    }
+
+
+def main():
+    """Writes MULTISETS_FILE from the command line."""
+    save_multisets()
+    print(f"Wrote {MULTISETS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# BaccaratStats.py
+
+import argparse
+import time
+
+import numpy as np
+
+from BaccaratLogic import BANKER, CARD_VALUE, NUM_DECKS, OUTCOMES, PLAYER, TIE
+
+# Rows in the bead plate and big road grids
+ROAD_ROWS = 6
+
+ROAD_LETTERS = ('B', 'P', 'T')
+
+_VALUES = CARD_VALUE.tolist()
+
+
+class ShoeStats:
+    """
+    Running statistics for one shoe, updated in O(1) per hand: outcome
+    counts, Banker/Player streaks, the bead plate and big road scoreboards,
+    pair and natural frequencies and the composition of the cards left.
+
+    Args:
+        num_decks (int, optional): Decks in the shoe, used for the running
+            composition; None skips composition tracking.
+    """
+
+    def __init__(self, num_decks=NUM_DECKS):
+        self.num_decks = num_decks
+        self.new_shoe()
+
+    def new_shoe(self):
+        """Resets every statistic for a freshly shuffled shoe."""
+        self.hands = 0
+        self.outcome_counts = [0, 0, 0]
+        self.player_pairs = 0
+        self.banker_pairs = 0
+        self.player_naturals = 0
+        self.banker_naturals = 0
+
+        # Ties do not break a streak
+        self.streak_outcome = None
+        self.streak_length = 0
+        self.longest_streak = [0, 0]  # Banker, Player
+
+        # Bead plate: one outcome per hand, filled down then across
+        self.bead_plate = []
+        # Big road: (row, column) -> [outcome, ties after it]; a streak runs
+        # down a column and turns right along its row when blocked
+        self.big_road = {}
+        self._road_cell = None
+        self._road_column = -1
+        # Set once a streak has turned right; it then stays on its row
+        self._tailing = False
+        self._leading_ties = 0
+
+        if self.num_decks:
+            self.composition = [16 * self.num_decks] + [4 * self.num_decks] * 9
+        else:
+            self.composition = None
+
+    def update(self, winner, player_cards, banker_cards):
+        """
+        Adds one hand.
+
+        Args:
+            winner (int): Outcome code (index into OUTCOMES).
+            player_cards (sequence of int): Player's card ranks (0 = not drawn).
+            banker_cards (sequence of int): Banker's card ranks (0 = not drawn).
+        """
+        self.hands += 1
+        self.outcome_counts[winner] += 1
+        self.bead_plate.append(winner)
+
+        if player_cards[0] == player_cards[1]:
+            self.player_pairs += 1
+        if banker_cards[0] == banker_cards[1]:
+            self.banker_pairs += 1
+        if (_VALUES[player_cards[0]] + _VALUES[player_cards[1]]) % 10 >= 8:
+            self.player_naturals += 1
+        if (_VALUES[banker_cards[0]] + _VALUES[banker_cards[1]]) % 10 >= 8:
+            self.banker_naturals += 1
+
+        if self.composition is not None:
+            for card in (*player_cards, *banker_cards):
+                if card:
+                    self.composition[_VALUES[card]] -= 1
+
+        if winner == TIE:
+            if self._road_cell is None:
+                self._leading_ties += 1
+            else:
+                self.big_road[self._road_cell][1] += 1
+            return
+
+        if winner == self.streak_outcome:
+            self.streak_length += 1
+            row, column = self._road_cell
+            if not self._tailing and row + 1 < ROAD_ROWS and (row + 1, column) not in self.big_road:
+                self._road_cell = (row + 1, column)
+            else:
+                self._road_cell = (row, column + 1)
+                self._tailing = True
+        else:
+            self.streak_outcome = winner
+            self.streak_length = 1
+            # A new streak starts in the next column whose top cell is free
+            self._road_column += 1
+            while (0, self._road_column) in self.big_road:
+                self._road_column += 1
+            self._road_cell = (0, self._road_column)
+            self._tailing = False
+        self.longest_streak[winner] = max(self.longest_streak[winner], self.streak_length)
+        self.big_road[self._road_cell] = [winner, self._leading_ties]
+        self._leading_ties = 0
+
+    def bead_plate_grid(self):
+        """
+        Returns:
+            grid (list of list): ROAD_ROWS rows of outcome codes, None where empty.
+        """
+        columns = -(-len(self.bead_plate) // ROAD_ROWS)
+        grid = [[None] * columns for _ in range(ROAD_ROWS)]
+        for i, outcome in enumerate(self.bead_plate):
+            grid[i % ROAD_ROWS][i // ROAD_ROWS] = outcome
+        return grid
+
+    def big_road_grid(self):
+        """
+        Returns:
+            grid (list of list): ROAD_ROWS rows of (outcome, ties) cells, None where empty.
+        """
+        columns = max((column for _, column in self.big_road), default=-1) + 1
+        grid = [[None] * columns for _ in range(ROAD_ROWS)]
+        for (row, column), (outcome, ties) in self.big_road.items():
+            grid[row][column] = (outcome, ties)
+        return grid
+
+    def summary(self):
+        """
+        Returns:
+            summary (dict): Counts and frequencies for the shoe so far.
+        """
+        hands = max(self.hands, 1)
+        return {
+            'hands': self.hands,
+            'outcomes': dict(zip(OUTCOMES, self.outcome_counts)),
+            'streak': (OUTCOMES[self.streak_outcome] if self.streak_outcome is not None else None,
+                       self.streak_length),
+            'longest_streak': {'Banker': self.longest_streak[BANKER], 'Player': self.longest_streak[PLAYER]},
+            'player_pair_rate': self.player_pairs / hands,
+            'banker_pair_rate': self.banker_pairs / hands,
+            'player_natural_rate': self.player_naturals / hands,
+            'banker_natural_rate': self.banker_naturals / hands,
+            'composition': list(self.composition) if self.composition is not None else None,
+        }
+
+
+def render_bead_plate(stats):
+    """
+    Args:
+        stats (ShoeStats): Statistics of the current shoe.
+
+    Returns:
+        text (str): The bead plate, one letter per hand.
+    """
+    return "\n".join(" ".join(ROAD_LETTERS[c] if c is not None else "." for c in row)
+                     for row in stats.bead_plate_grid())
+
+
+def render_big_road(stats):
+    """
+    Args:
+        stats (ShoeStats): Statistics of the current shoe.
+
+    Returns:
+        text (str): The big road; a lowercase letter marks a cell followed by ties.
+    """
+    def cell(c):
+        if c is None:
+            return "."
+        letter = ROAD_LETTERS[c[0]]
+        return letter.lower() if c[1] else letter
+    return "\n".join(" ".join(cell(c) for c in row) for row in stats.big_road_grid())
+
+
+def corpus_stats(path, limit=None):
+    """
+    Runs ShoeStats over every shoe of a BaccaratDataset corpus and totals the
+    per-shoe results.
+
+    Args:
+        path (str): Dataset directory.
+        limit (int, optional): Only use the first 'limit' games.
+
+    Returns:
+        totals (dict): Shoes, hands, outcome counts, pair and natural rates,
+            and the distribution of the longest Banker/Player streak per shoe.
+    """
+    from BaccaratDataset import CHUNK_SIZE, load_shoe_starts, open_dataset, unpack_cards
+
+    metadata, winners, cards = open_dataset(path)
+    stop = len(winners) if limit is None else min(limit, len(winners))
+    shoe_starts = set(load_shoe_starts(path).tolist())
+    stats = ShoeStats(metadata['num_decks'])
+    totals = {'shoes': 0, 'hands': 0, 'outcomes': [0, 0, 0], 'player_pairs': 0, 'banker_pairs': 0,
+              'player_naturals': 0, 'banker_naturals': 0}
+    longest = []
+
+    def close_shoe():
+        if stats.hands:
+            totals['shoes'] += 1
+            totals['hands'] += stats.hands
+            for code in range(3):
+                totals['outcomes'][code] += stats.outcome_counts[code]
+            for key in ('player_pairs', 'banker_pairs', 'player_naturals', 'banker_naturals'):
+                totals[key] += getattr(stats, key)
+            longest.append(max(stats.longest_streak))
+
+    for start in range(0, stop, CHUNK_SIZE):
+        end = min(start + CHUNK_SIZE, stop)
+        player_cards, banker_cards = unpack_cards(np.asarray(cards[start:end]))
+        for i, (winner, p, b) in enumerate(zip(winners[start:end].tolist(), player_cards.tolist(),
+                                               banker_cards.tolist()), start):
+            if i in shoe_starts:
+                close_shoe()
+                stats.new_shoe()
+            stats.update(winner, p, b)
+    close_shoe()
+
+    hands = max(totals['hands'], 1)
+    longest = np.array(longest)
+    return {
+        'shoes': totals['shoes'],
+        'hands': totals['hands'],
+        'outcomes': dict(zip(OUTCOMES, totals['outcomes'])),
+        'player_pair_rate': totals['player_pairs'] / hands,
+        'banker_pair_rate': totals['banker_pairs'] / hands,
+        'player_natural_rate': totals['player_naturals'] / hands,
+        'banker_natural_rate': totals['banker_naturals'] / hands,
+        'longest_streak_mean': float(longest.mean()) if len(longest) else 0.0,
+        'longest_streak_max': int(longest.max()) if len(longest) else 0,
+    }
+
+
+def main():
+    """Prints corpus-wide shoe statistics from the command line."""
+    parser = argparse.ArgumentParser(description="Shoe statistics over a Baccarat dataset.")
+    parser.add_argument("path", help="Dataset directory written by BaccaratDataset.py")
+    parser.add_argument("--limit", type=int, default=None, help="Only use the first N games")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    totals = corpus_stats(args.path, args.limit)
+    elapsed = time.perf_counter() - start
+    print(f"{totals['hands']:,} hands in {totals['shoes']:,} shoes ({elapsed:.1f}s)")
+    for name, count in totals['outcomes'].items():
+        print(f"{name:<8}{count / max(totals['hands'], 1) * 100:6.2f}%")
+    for key in ('player_pair_rate', 'banker_pair_rate', 'player_natural_rate', 'banker_natural_rate'):
+        print(f"{key.replace('_', ' ').capitalize():<22}{totals[key] * 100:6.2f}%")
+    print(f"Longest streak per shoe: mean {totals['longest_streak_mean']:.2f}, max {totals['longest_streak_max']}")
+
+
+if __name__ == "__main__":
+    main()
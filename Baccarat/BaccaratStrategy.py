@@ -1,14 +1,82 @@
 # BaccaratStrategy.py
 
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.model_selection import train_test_split
 from sklearn.neural_network import MLPClassifier
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 import joblib
-from BaccaratLogic import play_baccarat  # Ensure correct import
+from BaccaratDataset import iter_chunks, open_dataset
+from BaccaratLogic import NUM_DECKS, OUTCOMES, TIE, simulate_many
+from BaccaratModel import MODEL_WEIGHTS, CompiledModel
+from BaccaratOdds import return_to_player
+
+# Games per streamed training batch
+CHUNK_SIZE = 100_000
+
+MODEL_PICKLE = "baccarat_model_with_history.pkl"
+
+
+def simulate_outcomes(num_games, chunk_size=CHUNK_SIZE, rng=None, num_decks=NUM_DECKS):
+    """
+    Streams simulated game outcomes in fixed-size chunks, so any number of
+    games can be produced in bounded memory.
+
+    Args:
+        num_games (int): Total number of games to simulate.
+        chunk_size (int): Games per chunk.
+        rng (np.random.Generator or int, optional): Random generator or seed.
+        num_decks (int): Decks per shoe; None draws from an infinite deck.
+
+    Yields:
+        winners (np.ndarray): uint8 outcome codes (indices into OUTCOMES).
+    """
+    rng = np.random.default_rng(rng)
+    for start in range(0, num_games, chunk_size):
+        yield simulate_many(min(chunk_size, num_games - start), rng, num_decks)['winner']
+
+
+def iter_training_batches(outcome_chunks, history_length=3):
+    """
+    Turns a stream of outcome chunks into (X, y) batches. Each row of X is a
+    sliding-window view of the 'history_length' outcomes before its target,
+    so no per-sample copies are made; windows continue across chunk
+    boundaries, and the stream starts from a history of Ties.
+
+    Args:
+        outcome_chunks (iterable of np.ndarray): Outcome codes, in game order.
+        history_length (int): Number of past game outcomes to use as features.
+
+    Yields:
+        X (np.ndarray): (n, history_length) encoded histories (read-only view).
+        y (np.ndarray): (n,) encoded outcome following each history.
+    """
+    carry = np.full(history_length, TIE, dtype=np.uint8)
+    for winners in outcome_chunks:
+        stream = np.concatenate([carry, winners])
+        yield sliding_window_view(stream, history_length)[:-1], stream[history_length:]
+        carry = stream[len(stream) - history_length:]
 
 
-def generate_training_data(num_samples=10000, history_length=3):
+def make_label_encoder():
+    """
+    Returns:
+        label_encoder (LabelEncoder): Encoder fitted on OUTCOMES, whose codes
+            match the simulator's outcome codes.
+    """
+    label_encoder = LabelEncoder()
+    label_encoder.fit(OUTCOMES)
+    return label_encoder
+
+
+def generate_training_data(num_samples=10000, history_length=3, dataset=None):
     """
     Generates synthetic Baccarat game data with historical outcomes.
     Each sample includes the outcomes of the last 'history_length' games.
@@ -16,46 +84,37 @@ def generate_training_data(num_samples=10000, history_length=3):
     Args:
         num_samples (int): Number of samples to generate.
         history_length (int): Number of past game outcomes to include as features.
+        dataset (str, optional): Take the first num_samples games from this
+            dataset directory (see BaccaratDataset) instead of simulating.
 
     Returns:
         X (np.ndarray): Feature matrix.
         y (np.ndarray): Target vector.
         label_encoder (LabelEncoder): Fitted label encoder.
     """
-    X = []
-    y = []
-
-    # Initialize history with 'Tie' to handle initial games
-    history = ['Tie'] * history_length
-
-    for _ in range(num_samples):
-        # Simulate a game
-        _, _, winner, _, _, _, _, _, _ = play_baccarat()
+    if dataset is not None:
+        _, winners, _ = open_dataset(dataset)
+        outcome_chunks = iter_chunks(winners, CHUNK_SIZE, stop=num_samples)
+    else:
+        outcome_chunks = simulate_outcomes(num_samples)
+    batches = list(iter_training_batches(outcome_chunks, history_length))
+    X = np.concatenate([X for X, _ in batches]).astype(np.int64)
+    y = np.concatenate([y for _, y in batches]).astype(np.int64)
+    return X, y, make_label_encoder()
 
-        # Append the last 'history_length' outcomes as features
-        features = history.copy()
-        X.append(features)
-        y.append(winner)
-
-        # Update history
-        history.pop(0)
-        history.append(winner)
-
-    # Encode categorical features
-    label_encoder = LabelEncoder()
-    all_outcomes = ['Player', 'Banker', 'Tie']
-    label_encoder.fit(all_outcomes)
 
-    # Transform features and targets
-    X_encoded = []
-    for sample in X:
-        encoded_sample = label_encoder.transform(sample)
-        X_encoded.append(encoded_sample)
-
-    X_encoded = np.array(X_encoded)
-    y_encoded = label_encoder.transform(y)
+def save_model(model, scaler, label_encoder):
+    """
+    Saves the model, scaler and label encoder to MODEL_PICKLE, and the
+    compiled NumPy weights to MODEL_WEIGHTS.
 
-    return X_encoded, y_encoded, label_encoder
+    Args:
+        model (MLPClassifier): Trained machine learning model.
+        scaler (StandardScaler): Fitted scaler for feature normalization.
+        label_encoder (LabelEncoder): Fitted label encoder.
+    """
+    joblib.dump({'model': model, 'scaler': scaler, 'label_encoder': label_encoder}, MODEL_PICKLE)
+    CompiledModel.from_sklearn(model, scaler, label_encoder).save(MODEL_WEIGHTS)
 
 
 def train_model(history_length=3):
@@ -91,11 +150,192 @@ def train_model(history_length=3):
     print(f"Model Accuracy: {accuracy * 100:.2f}%")
 
     # Save both the model and the scaler and label encoder
-    joblib.dump({'model': model, 'scaler': scaler, 'label_encoder': label_encoder}, "baccarat_model_with_history.pkl")
+    save_model(model, scaler, label_encoder)
+
+    return model, scaler, label_encoder
+
+
+def train_model_streaming(num_samples, history_length=3, batch_size=CHUNK_SIZE, seed=None, outcome_chunks=None):
+    """
+    Trains the same network as train_model on a stream of simulated games,
+    one partial_fit call per batch, so memory use does not grow with
+    num_samples. The scaler is fitted on the first batch and a separately
+    simulated batch is held out for evaluation.
+
+    Args:
+        num_samples (int): Number of games to train on.
+        history_length (int): Number of past game outcomes to include as features.
+        batch_size (int): Games per batch.
+        seed (int, optional): Seed for the simulated games.
+        outcome_chunks (iterable of np.ndarray, optional): Outcome codes to
+            train on instead of simulating num_samples games.
+
+    Returns:
+        model (MLPClassifier): Trained machine learning model.
+        scaler (StandardScaler): Fitted scaler for feature normalization.
+        label_encoder (LabelEncoder): Fitted label encoder.
+    """
+    train_rng, test_rng = np.random.default_rng(seed).spawn(2)
+    if outcome_chunks is None:
+        outcome_chunks = simulate_outcomes(num_samples, batch_size, train_rng)
+
+    scaler = StandardScaler()
+    model = MLPClassifier(hidden_layer_sizes=(32, 16), random_state=42)
+    classes = np.arange(len(OUTCOMES))
+
+    games = 0
+    for X, y in iter_training_batches(outcome_chunks, history_length):
+        if games == 0:
+            scaler.fit(X)
+        model.partial_fit(scaler.transform(X), y, classes=classes)
+        games += len(y)
+        print(f"Trained on {games:,} games", end="\r")
+    print()
+
+    X_test, y_test = next(iter_training_batches(simulate_outcomes(batch_size, batch_size, test_rng), history_length))
+    accuracy = model.score(scaler.transform(X_test), y_test)
+    print(f"Model Accuracy: {accuracy * 100:.2f}%")
+
+    label_encoder = make_label_encoder()
+    save_model(model, scaler, label_encoder)
 
     return model, scaler, label_encoder
 
 
+def evaluate_config(dataset, history_length, hidden_layer_sizes, num_samples, test_games, max_iter=200):
+    """
+    Trains one model on the first num_samples games of a dataset and scores it
+    on the last test_games games, which are never trained on.
+
+    Args:
+        dataset (str): Dataset directory written by BaccaratDataset.
+        history_length (int): Number of past game outcomes to use as features.
+        hidden_layer_sizes (tuple of int): Hidden layer sizes of the network.
+        num_samples (int): Number of games to train on.
+        test_games (int): Number of held-out games to score on.
+        max_iter (int): Maximum training epochs.
+
+    Returns:
+        result (dict): The configuration with its accuracy, RTP from betting the
+            model's suggestion on every held-out game, training time and
+            prediction time per game.
+    """
+    _, winners, _ = open_dataset(dataset)
+    if num_samples + test_games > len(winners):
+        raise ValueError(f"Dataset has {len(winners):,} games; {num_samples + test_games:,} needed.")
+
+    (X_train, y_train), = iter_training_batches([winners[:num_samples]], history_length)
+    (X_test, y_test), = iter_training_batches([winners[len(winners) - test_games:]], history_length)
+
+    start = time.perf_counter()
+    scaler = StandardScaler()
+    model = MLPClassifier(hidden_layer_sizes=hidden_layer_sizes, max_iter=max_iter, random_state=42)
+    model.fit(scaler.fit_transform(X_train), y_train)
+    train_seconds = time.perf_counter() - start
+
+    compiled = CompiledModel.from_sklearn(model, scaler, make_label_encoder())
+    start = time.perf_counter()
+    predictions = compiled.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+
+    return {
+        'history_length': history_length,
+        'hidden_layer_sizes': list(hidden_layer_sizes),
+        'num_samples': num_samples,
+        'accuracy': float((predictions == y_test).mean()),
+        'rtp': return_to_player(predictions, y_test),
+        'train_seconds': train_seconds,
+        'predict_us_per_game': predict_seconds / len(y_test) * 1e6,
+    }
+
+
+def run_sweep(dataset, history_lengths, layer_sizes, sample_counts, test_games=100_000, workers=None, output=None):
+    """
+    Evaluates every combination of history length, layer sizes and sample
+    count across a process pool. All workers memory-map the same dataset.
+
+    Args:
+        dataset (str): Dataset directory written by BaccaratDataset.
+        history_lengths (list of int): History lengths to try.
+        layer_sizes (list of tuple of int): Hidden layer sizes to try.
+        sample_counts (list of int): Training set sizes to try.
+        test_games (int): Held-out games each model is scored on.
+        workers (int, optional): Worker processes (default: all cores).
+        output (str, optional): Write the leaderboard to this JSON file.
+
+    Returns:
+        leaderboard (list of dict): evaluate_config results, best RTP first.
+    """
+    configs = list(product(history_lengths, layer_sizes, sample_counts))
+    results = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(evaluate_config, dataset, h, layers, n, test_games) for h, layers, n in configs]
+        for future in as_completed(futures):
+            results.append(future.result())
+            print(f"Finished {len(results)}/{len(configs)} configurations", end="\r")
+    print()
+
+    leaderboard = sorted(results, key=lambda r: (-r['rtp'], -r['accuracy'], r['train_seconds']))
+    if output:
+        with open(output, 'w') as f:
+            json.dump(leaderboard, f, indent=2)
+    return leaderboard
+
+
+def print_leaderboard(leaderboard):
+    """
+    Prints sweep results as a table.
+
+    Args:
+        leaderboard (list of dict): Results from run_sweep.
+    """
+    print(f"{'Rank':<6}{'History':>8}{'Layers':>12}{'Samples':>12}{'Accuracy':>10}{'RTP':>9}"
+          f"{'Train s':>9}{'Predict us':>12}")
+    for rank, r in enumerate(leaderboard, 1):
+        layers = '-'.join(str(n) for n in r['hidden_layer_sizes'])
+        print(f"{rank:<6}{r['history_length']:>8}{layers:>12}{r['num_samples']:>12,}{r['accuracy'] * 100:>9.2f}%"
+              f"{r['rtp'] * 100:>8.2f}%{r['train_seconds']:>9.1f}{r['predict_us_per_game']:>12.3f}")
+
+
+def main():
+    """Trains the model; --games or --dataset switch to streaming training, --sweep to a grid search."""
+    parser = argparse.ArgumentParser(description="Train the Baccarat outcome model.")
+    parser.add_argument("--games", type=int, default=0, help="Stream-train on this many simulated games")
+    parser.add_argument("--history-length", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--dataset", help="Stream-train on a dataset directory written by BaccaratDataset.py")
+    parser.add_argument("--sweep", action="store_true", help="Grid-search configurations on --dataset")
+    parser.add_argument("--history-lengths", default="1,3,5,8", help="Sweep: comma-separated history lengths")
+    parser.add_argument("--layers", default="16,32-16,64-32", help="Sweep: comma-separated layer sizes, e.g. 32-16")
+    parser.add_argument("--samples", default="10000,100000", help="Sweep: comma-separated training set sizes")
+    parser.add_argument("--test-games", type=int, default=100_000, help="Sweep: held-out games per model")
+    parser.add_argument("--workers", type=int, default=0, help="Sweep: worker processes (0 = all cores)")
+    parser.add_argument("--output", default="sweep_results.json", help="Sweep: leaderboard JSON file")
+    args = parser.parse_args()
+
+    if args.sweep:
+        if not args.dataset:
+            parser.error("--sweep needs --dataset")
+        leaderboard = run_sweep(
+            args.dataset,
+            [int(h) for h in args.history_lengths.split(',')],
+            [tuple(int(n) for n in layers.split('-')) for layers in args.layers.split(',')],
+            [int(n) for n in args.samples.split(',')],
+            args.test_games, args.workers or None, args.output,
+        )
+        print_leaderboard(leaderboard)
+    elif args.dataset:
+        _, winners, _ = open_dataset(args.dataset)
+        stop = args.games or None
+        train_model_streaming(len(winners[:stop]), args.history_length, args.batch_size, args.seed,
+                              outcome_chunks=iter_chunks(winners, args.batch_size, stop=stop))
+    elif args.games:
+        train_model_streaming(args.games, args.history_length, args.batch_size, args.seed)
+    else:
+        train_model(args.history_length)
+
+
 if __name__ == "__main__":
     # Optional: Train the model when this script is run directly
-    train_model()
+    main()
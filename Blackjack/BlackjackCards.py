@@ -25,6 +25,22 @@ class Card:
         self.rank = rank
         self.value = Card.VALUES[rank]
 
+    _by_code = None
+
+    @classmethod
+    def from_code(cls, code):
+        """Shared Card for a card code (rank index * 4 + suit index, 0-51)."""
+        if cls._by_code is None:
+            cls._by_code = tuple(cls(suit, rank) for rank in cls.RANKS for suit in cls.SUITS)
+        return cls._by_code[code]
+
     def __str__(self):
         suit_symbol = Card.SUIT_SYMBOLS.get(self.suit, self.suit)
         return f"{self.rank} {suit_symbol}"
+
+
+# Shoes deal card codes 0-51: rank index * 4 + suit index, in RANKS and SUITS order
+CODE_RANKS = tuple(rank for rank in Card.RANKS for _ in Card.SUITS)
+CODE_VALUES = tuple(Card.VALUES[rank] for rank in CODE_RANKS)
+# Composition index of each code: 0 for an Ace, 1-8 for 2-9, 9 for any ten-value card
+CODE_INDEXES = tuple(0 if rank == 'Ace' else Card.VALUES[rank] - 1 for rank in CODE_RANKS)
@@ -0,0 +1,179 @@
+import argparse
+import math
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from BlackjackCards import CODE_INDEXES
+from BlackjackDeck import Deck
+from BlackjackLogic import BlackjackGame
+from BlackjackStrategy import make_basic_strategy_policy
+
+# tags: count added per card, by composition index (Ace, 2-9, ten-value).
+# Balanced systems bet on the true count; unbalanced ones on the running
+# count, started at initial_count(num_decks).
+CountSystem = namedtuple('CountSystem', ['tags', 'balanced', 'initial_count', 'ramp'])
+
+COUNT_SYSTEMS = {
+    'hilo': CountSystem((-1, 1, 1, 1, 1, 1, 0, 0, 0, -1), True, lambda num_decks: 0,
+                        '2:2,3:4,4:6,5:8'),
+    'ko': CountSystem((-1, 1, 1, 1, 1, 1, 1, 0, 0, -1), False, lambda num_decks: 4 - 4 * num_decks,
+                      '-2:2,0:4,2:6,4:8'),
+    'omega2': CountSystem((0, 1, 1, 2, 2, 2, 1, 0, -1, -2), True, lambda num_decks: 0,
+                          '4:2,6:4,8:6,10:8'),
+}
+
+# Shoes played per task handed to the process pool
+SHOES_PER_TASK = 500
+
+
+class CountingDeck(Deck):
+    """A Deck that keeps the running count of a COUNT_SYSTEMS system, updated in O(1) per card dealt."""
+
+    def __init__(self, system, num_decks=1, penetration=1.0, rng=None):
+        self.system = system
+        # Tag of every card code, so a deal is one lookup and one add
+        self.code_tags = tuple(system.tags[index] for index in CODE_INDEXES)
+        super().__init__(num_decks=num_decks, penetration=penetration, rng=rng)
+
+    def shuffle(self):
+        super().shuffle()
+        self.running_count = self.system.initial_count(self.num_decks)
+
+    def deal_code(self):
+        code = super().deal_code()
+        self.running_count += self.code_tags[code]
+        return code
+
+    def true_count(self):
+        """Running count per deck remaining, floored."""
+        return math.floor(self.running_count * 52 / max(self.remaining(), 1))
+
+    def betting_count(self):
+        return self.true_count() if self.system.balanced else self.running_count
+
+
+def parse_ramp(text):
+    """
+    "2:2,3:4" -> ((2, 2), (3, 4)): bet 2 units from a count of 2, 4 units
+    from 3, and 1 unit below the first step.
+    """
+    steps = []
+    for step in text.split(','):
+        count, units = step.split(':')
+        steps.append((int(count), float(units)))
+    return tuple(sorted(steps))
+
+
+def ramp_units(ramp, count):
+    units = 1.0
+    for threshold, step_units in ramp:
+        if count < threshold:
+            break
+        units = step_units
+    return units
+
+
+def simulate_shoes(num_shoes, system_name, ramp, num_decks=6, penetration=0.75, seed=None):
+    """
+    Plays num_shoes full shoes of BlackjackGame with basic strategy, betting
+    ramp_units(ramp, count) units each round from the count before the deal.
+    Every dealt card is counted, the dealer's hole card included, since all
+    of them are shown before the next bet.
+
+    returns: dict of sums over all rounds, which merge by adding: rounds,
+    shoes, net, net_squared, units (initial bets) and wagered, all in units.
+    """
+    deck = CountingDeck(COUNT_SYSTEMS[system_name], num_decks, penetration, random.Random(seed))
+    game = BlackjackGame(starting_stack=float('inf'), policy=make_basic_strategy_policy(num_decks), verbose=False,
+                         deck=deck)
+    totals = {'shoes': num_shoes, 'rounds': 0, 'net': 0.0, 'net_squared': 0.0, 'units': 0.0, 'wagered': 0.0}
+    for _ in range(num_shoes):
+        deck.shuffle()
+        while not deck.needs_shuffle():
+            units = ramp_units(ramp, deck.betting_count())
+            game.player.place_bet(units)
+            net = game.play_hand()
+            totals['rounds'] += 1
+            totals['net'] += net
+            totals['net_squared'] += net * net
+            totals['units'] += units
+            totals['wagered'] += sum(hand.bet for hand in game.player.hands)
+    return totals
+
+
+def run_parallel(num_shoes, system_name, ramp, num_decks=6, penetration=0.75, seed=None, workers=None,
+                 shoes_per_task=SHOES_PER_TASK):
+    """Splits num_shoes into independently seeded tasks over a process pool and merges their totals."""
+    tasks = [min(shoes_per_task, num_shoes - start) for start in range(0, num_shoes, shoes_per_task)]
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(tasks))]
+    totals = {'shoes': 0, 'rounds': 0, 'net': 0.0, 'net_squared': 0.0, 'units': 0.0, 'wagered': 0.0}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(simulate_shoes, shoes, system_name, ramp, num_decks, penetration, task_seed)
+                   for shoes, task_seed in zip(tasks, seeds)]
+        for future in futures:
+            for key, value in future.result().items():
+                totals[key] += value
+    return totals
+
+
+def summarize(totals, bankroll=1000.0):
+    """
+    Win rate, SD, N0 and risk of ruin from simulate_shoes totals, all in units.
+
+    N0 is the number of rounds after which the expected win equals one
+    standard deviation (variance / EV**2). Risk of ruin uses the diffusion
+    approximation exp(-2 * EV * bankroll / variance) per round.
+    """
+    rounds = totals['rounds']
+    ev = totals['net'] / rounds
+    variance = totals['net_squared'] / rounds - ev * ev
+    return {
+        'shoes': totals['shoes'],
+        'rounds': rounds,
+        'ev_per_round': ev,
+        'sd_per_round': math.sqrt(variance),
+        'win_rate_per_100': 100 * ev,
+        'sd_per_100': 10 * math.sqrt(variance),
+        'mean_bet': totals['units'] / rounds,
+        'return_per_wagered': totals['net'] / totals['wagered'],
+        'n0': variance / (ev * ev) if ev else float('inf'),
+        'risk_of_ruin': math.exp(-2 * ev * bankroll / variance) if ev > 0 else 1.0,
+        'standard_error': math.sqrt(variance / rounds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate card counting with a bet ramp over many shoes.")
+    parser.add_argument("--system", default="hilo", choices=sorted(COUNT_SYSTEMS))
+    parser.add_argument("--ramp", default=None,
+                        help="count:units steps, e.g. 2:2,3:4,4:8 (default: the system's own ramp)")
+    parser.add_argument("--shoes", type=int, default=100_000)
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--penetration", type=float, default=0.75)
+    parser.add_argument("--bankroll", type=float, default=1000.0, help="Bankroll in units, for risk of ruin")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    ramp = parse_ramp(args.ramp or COUNT_SYSTEMS[args.system].ramp)
+    start = time.perf_counter()
+    totals = run_parallel(args.shoes, args.system, ramp, args.decks, args.penetration, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+    report = summarize(totals, args.bankroll)
+    print(f"{report['shoes']:,} shoes, {report['rounds']:,} rounds in {elapsed:.1f}s "
+          f"({report['rounds'] / elapsed:,.0f} rounds/s)")
+    print(f"System {args.system}, ramp " + ', '.join(f"{c:+d}: {u:g}u" for c, u in ramp))
+    print(f"Win rate: {report['win_rate_per_100']:+.2f} units per 100 rounds "
+          f"(+/- {196 * report['standard_error']:.2f}), mean bet {report['mean_bet']:.2f} units")
+    print(f"SD: {report['sd_per_round']:.3f} units per round, {report['sd_per_100']:.2f} per 100 rounds")
+    print(f"Return per unit wagered: {report['return_per_wagered'] * 100:+.3f}%")
+    print(f"N0: {report['n0']:,.0f} rounds")
+    print(f"Risk of ruin with {args.bankroll:g} units: {report['risk_of_ruin'] * 100:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,49 @@
 import random
-from BlackjackCards import Card
+from BlackjackCards import CODE_INDEXES, Card
 
 class Deck:
-    def __init__(self, num_decks=1):
+    """
+    A shoe of num_decks decks held as card codes (see BlackjackCards.CODE_RANKS)
+    in a preallocated bytearray. Dealing advances a cursor; Card objects are
+    shared instances looked up only when a card is dealt with deal_card().
+    counts holds the undealt cards per composition index (CODE_INDEXES) and is
+    updated as each card is dealt.
+    """
+
+    def __init__(self, num_decks=1, penetration=1.0, rng=None):
         self.num_decks = num_decks
-        self.cards = []
+        self.penetration = penetration  # fraction of the shoe dealt before the cut card
+        self.rng = rng or random
+        self.cards = bytearray(range(52)) * num_decks
+        self.cut_card = int(len(self.cards) * penetration)
+        self.position = 0
         self.build()
 
     def build(self):
-        self.cards = []
-        for _ in range(self.num_decks):
-            for suit in Card.SUITS:
-                for rank in Card.RANKS:
-                    self.cards.append(Card(suit, rank))
+        # Every card is always in the buffer; rebuilding is just a reshuffle
         self.shuffle()
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
+        self.position = 0
+        self.counts = [4 * self.num_decks] * 9 + [16 * self.num_decks]
+
+    def remaining(self):
+        return len(self.cards) - self.position
+
+    def needs_shuffle(self):
+        return self.position >= self.cut_card
+
+    def composition(self):
+        return tuple(self.counts)
+
+    def deal_code(self):
+        if self.position >= len(self.cards):
+            self.build()  # Reshuffle if out of cards
+        code = self.cards[self.position]
+        self.position += 1
+        self.counts[CODE_INDEXES[code]] -= 1
+        return code
 
     def deal_card(self):
-        if len(self.cards) == 0:
-            self.build()  # Rebuild and shuffle if out of cards
-        return self.cards.pop()
+        return Card.from_code(self.deal_code())
@@ -1,12 +1,32 @@
 from BlackjackDeck import Deck
 from BlackjackPlayer import Player, Hand
+from BlackjackStrategy import card_index, option_evs
 
 
 class BlackjackGame:
-    def __init__(self, starting_stack=1000, num_decks=1):
-        self.deck = Deck(num_decks=num_decks)
+    OPTION_LABELS = {'h': '[H]it', 's': '[S]tand', 'p': '[P]split', 'd': '[D]ouble Down'}
+
+    def __init__(self, starting_stack=1000, num_decks=1, penetration=0.75, policy=None, verbose=True, rng=None,
+                 hints=True, deck=None):
+        """
+        policy: callable policy(hand, dealer_upcard, options) returning one of
+        options ('h', 's', 'd', 'p'); defaults to asking at the console.
+        verbose: print the table and results; False runs the game silently.
+        rng: random.Random for shuffling (default: the random module).
+        hints: show the EV of each option when asking at the console.
+        deck: play from this Deck (e.g. a subclass) instead of building one from
+        num_decks, penetration and rng.
+        """
+        self.deck = deck if deck is not None else Deck(num_decks=num_decks, penetration=penetration, rng=rng)
         self.player = Player(name="Player", stack=starting_stack)
         self.dealer = Player(name="Dealer", stack=0)  # Dealer doesn't use stack
+        self.policy = policy or self.ask_player
+        self.verbose = verbose
+        self.hints = hints
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
 
     def take_bet(self):
         while True:
@@ -21,7 +41,10 @@ class BlackjackGame:
                 print(f"Invalid input: {e}")
 
     def initial_deal(self):
+        # Keep the bet placed on the player's hand
+        bet = self.player.hands[0].bet if self.player.hands else 0
         self.player.reset_hands()
+        self.player.hands[0].bet = bet
         self.dealer.reset_hands()
 
         # Dealer starts with one hand
@@ -33,6 +56,8 @@ class BlackjackGame:
             self.dealer.hands[0].add_card(self.deck.deal_card())  # Deal to dealer's single hand
 
     def show_hands(self, show_dealer_card=False):
+        if not self.verbose:
+            return
         print("\n--- Hands ---")
         # Show player's hands
         for idx, hand in enumerate(self.player.hands):
@@ -52,59 +77,92 @@ class BlackjackGame:
                 print("Dealer: No cards dealt yet.")
         print("------------\n")
 
+    def available_options(self, hand):
+        options = ['h', 's']
+        if len(hand.cards) == 2 and self.player.stack >= hand.bet:
+            if hand.can_split():
+                options.append('p')
+            options.append('d')
+        return options
+
+    def unseen_composition(self):
+        """Cards the player has not seen per composition index: the shoe plus the dealer's hole card."""
+        counts = list(self.deck.counts)
+        dealer_cards = self.dealer.hands[0].cards
+        if len(dealer_cards) > 1:
+            counts[card_index(dealer_cards[1])] += 1
+        return tuple(counts)
+
+    def ev_hint(self, hand, dealer_upcard, options):
+        """Approximate EV per unit bet of each option for the cards still unseen (see BlackjackStrategy.hand_evs)."""
+        return option_evs(hand, dealer_upcard, options, self.unseen_composition())
+
+    def ask_player(self, hand, dealer_upcard, options):
+        """Console policy: show the table and read a choice until it is valid."""
+        while True:
+            self.show_hands()
+            if self.hints:
+                evs = self.ev_hint(hand, dealer_upcard, options)
+                best = max(evs, key=evs.get)
+                print("Approx. EV per unit bet: " + ', '.join(
+                    f"{self.OPTION_LABELS[option]} {ev:+.3f}{' *' if option == best else ''}"
+                    for option, ev in evs.items()))
+            print(f"Options for Hand {self.player.current_hand_index + 1}: "
+                  + ', '.join(self.OPTION_LABELS[option] for option in options))
+            choice = input("Choose an option: ").strip().lower()
+            if choice in options:
+                return choice
+            print("Invalid choice. Please choose a valid option.")
+
     def player_turn(self):
         for hand_index, hand in enumerate(self.player.hands):
             self.player.current_hand_index = hand_index
             while hand.is_active and not hand.is_busted() and not hand.has_blackjack():
-                self.show_hands()
-                options = ['[H]it', '[S]tand']
-                if len(hand.cards) == 2 and self.player.stack >= hand.bet:
-                    if hand.can_split():
-                        options.append('[P]split')
-                    options.append('[D]ouble Down')
-                print(f"Options for Hand {hand_index + 1}: " + ', '.join(options))
-                choice = input("Choose an option: ").strip().lower()
+                options = self.available_options(hand)
+                choice = self.policy(hand, self.dealer.hands[0].cards[0], options)
+                if choice not in options:
+                    raise ValueError(f"Invalid choice {choice!r}; options are {options}")
 
                 if choice == 'h':
                     hand.add_card(self.deck.deal_card())
-                    print(f"Hand {hand_index + 1} hits.")
+                    self.log(f"Hand {hand_index + 1} hits.")
                 elif choice == 's':
                     hand.is_active = False
-                    print(f"Hand {hand_index + 1} stands.")
-                elif choice == 'd' and '[D]ouble Down' in options:
+                    self.log(f"Hand {hand_index + 1} stands.")
+                elif choice == 'd':
                     self.handle_double_down(hand)
-                elif choice == 'p' and '[P]split' in options:
-                    self.handle_split(hand_index)
                 else:
-                    print("Invalid choice. Please choose a valid option.")
+                    self.handle_split(hand_index)
+                    # Carry on with the first of the two new hands
+                    hand = self.player.hands[hand_index]
 
                 if hand.is_busted():
-                    print(f"Hand {hand_index + 1} has busted!")
+                    self.log(f"Hand {hand_index + 1} has busted!")
 
     def handle_double_down(self, hand):
         try:
             double_bet = hand.bet
             if double_bet > self.player.stack:
-                print("Insufficient funds to double down.")
+                self.log("Insufficient funds to double down.")
                 return
             hand.bet += double_bet
             self.player.stack -= double_bet
             hand.is_doubled = True
             hand.add_card(self.deck.deal_card())
             hand.is_active = False  # Automatically stands after doubling down
-            print(f"Hand doubled down. New bet: {hand.bet}")
+            self.log(f"Hand doubled down. New bet: {hand.bet}")
         except ValueError as e:
-            print(f"Error: {e}")
+            self.log(f"Error: {e}")
 
     def handle_split(self, hand_index):
         hand = self.player.hands[hand_index]
         if not hand.can_split():
-            print("Cannot split this hand.")
+            self.log("Cannot split this hand.")
             return
         try:
             split_bet = hand.bet
             if split_bet > self.player.stack:
-                print("Insufficient funds to split.")
+                self.log("Insufficient funds to split.")
                 return
             # Create two new hands
             card1 = hand.cards[0]
@@ -118,25 +176,27 @@ class BlackjackGame:
             # Deal one additional card to each new hand
             new_hand1.add_card(self.deck.deal_card())
             new_hand2.add_card(self.deck.deal_card())
-            print(f"Hand {hand_index + 1} has been split into two hands.")
+            self.log(f"Hand {hand_index + 1} has been split into two hands.")
         except ValueError as e:
-            print(f"Error: {e}")
+            self.log(f"Error: {e}")
 
     def dealer_turn(self):
-        print("\nDealer's turn:")
+        self.log("\nDealer's turn:")
         self.show_hands(show_dealer_card=True)
         dealer_hand = self.dealer.hands[0]
         while dealer_hand.calculate_value() < 17:
-            print("Dealer hits.")
+            self.log("Dealer hits.")
             dealer_hand.add_card(self.deck.deal_card())
             self.show_hands(show_dealer_card=True)
             if dealer_hand.is_busted():
-                print("Dealer has busted!")
+                self.log("Dealer has busted!")
                 break
         if not dealer_hand.is_busted():
-            print("Dealer stands.")
+            self.log("Dealer stands.")
 
     def settle_bets(self):
+        """Pays out every hand; returns the total paid back to the player."""
+        returned = 0
         dealer_hand = self.dealer.hands[0]
         dealer_value = dealer_hand.calculate_value()
         dealer_bust = dealer_hand.is_busted()
@@ -147,43 +207,56 @@ class BlackjackGame:
             player_bust = hand.is_busted()
             player_blackjack = hand.has_blackjack()
 
-            print(f"\nSettling Hand {idx + 1}:")
+            self.log(f"\nSettling Hand {idx + 1}:")
             if player_blackjack:
                 if dealer_blackjack:
-                    print("Both player and dealer have Blackjack. Push.")
-                    self.player.stack += hand.bet
+                    self.log("Both player and dealer have Blackjack. Push.")
+                    payout = hand.bet
                 else:
-                    print("Blackjack! You win 3:2.")
-                    winnings = hand.bet * 2.5
-                    self.player.stack += winnings
+                    self.log("Blackjack! You win 3:2.")
+                    payout = hand.bet * 2.5
             elif player_bust:
-                print("You busted. You lose your bet.")
-                # Bet is already deducted
+                self.log("You busted. You lose your bet.")
+                payout = 0  # Bet is already deducted
             elif dealer_bust:
-                print("Dealer busted. You win your bet.")
-                self.player.stack += hand.bet * 2
+                self.log("Dealer busted. You win your bet.")
+                payout = hand.bet * 2
             elif dealer_blackjack:
-                print("Dealer has Blackjack. You lose your bet.")
-                # Bet is already deducted
+                self.log("Dealer has Blackjack. You lose your bet.")
+                payout = 0  # Bet is already deducted
             else:
                 if player_value > dealer_value:
-                    print(f"You have {player_value} and dealer has {dealer_value}. You win!")
-                    self.player.stack += hand.bet * 2
+                    self.log(f"You have {player_value} and dealer has {dealer_value}. You win!")
+                    payout = hand.bet * 2
                 elif player_value < dealer_value:
-                    print(f"You have {player_value} and dealer has {dealer_value}. You lose.")
-                    # Bet is already deducted
+                    self.log(f"You have {player_value} and dealer has {dealer_value}. You lose.")
+                    payout = 0  # Bet is already deducted
                 else:
-                    print(f"Both have {player_value}. Push.")
-                    self.player.stack += hand.bet
+                    self.log(f"Both have {player_value}. Push.")
+                    payout = hand.bet
+            self.player.stack += payout
+            returned += payout
+        return returned
 
-    def play_round(self):
-        self.take_bet()
+    def play_hand(self):
+        """
+        Plays a round once the bet is on the player's hand: deal, player and
+        dealer turns, settlement. Returns the player's net result for the round.
+        """
+        if self.deck.needs_shuffle():
+            self.log("Cut card reached. Shuffling the shoe.")
+            self.deck.shuffle()
         self.initial_deal()
         self.show_hands()
         self.player_turn()
         if any(not hand.is_busted() and not hand.has_blackjack() for hand in self.player.hands):
             self.dealer_turn()
-        self.settle_bets()
+        returned = self.settle_bets()
+        return returned - sum(hand.bet for hand in self.player.hands)
+
+    def play_round(self):
+        self.take_bet()
+        self.play_hand()
         print(f"\nYour current stack: {self.player.stack}\n")
 
     def is_game_over(self):
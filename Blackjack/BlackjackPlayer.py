@@ -9,8 +9,12 @@ class Hand:
         self.cards.append(card)
 
     def calculate_value(self):
-        value = sum(card.value for card in self.cards)
-        aces = sum(1 for card in self.cards if card.rank == 'Ace')
+        value = 0
+        aces = 0
+        for card in self.cards:
+            value += card.value
+            if card.rank == 'Ace':
+                aces += 1
         while value > 21 and aces:
             value -= 10
             aces -= 1
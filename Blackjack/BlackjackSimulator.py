@@ -0,0 +1,68 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from BlackjackLogic import BlackjackGame
+from BlackjackStrategy import make_basic_strategy_policy
+
+
+def dealer_policy(hand, dealer_upcard, options):
+    """Plays like the dealer: hit below 17, otherwise stand."""
+    return 'h' if hand.calculate_value() < 17 else 's'
+
+
+def never_bust_policy(hand, dealer_upcard, options):
+    """Stands on any total that could bust with one more card."""
+    return 'h' if hand.calculate_value() < 12 else 's'
+
+
+POLICIES = {
+    'dealer': lambda num_decks: dealer_policy,
+    'never_bust': lambda num_decks: never_bust_policy,
+    'basic': make_basic_strategy_policy,
+}
+
+
+def simulate(rounds, policy, num_decks=6, penetration=0.75, bet=1.0, seed=None):
+    """
+    Plays `rounds` rounds of BlackjackGame with every decision made by
+    policy(hand, dealer_upcard, options), with no console input or output.
+    The player's stack is unlimited, so doubles and splits are always allowed.
+
+    returns: (net, wagered) float arrays with the player's net result and the
+    total staked (including doubles and splits) for every round.
+    """
+    game = BlackjackGame(starting_stack=float('inf'), num_decks=num_decks, penetration=penetration,
+                         policy=policy, verbose=False, rng=random.Random(seed))
+    net = np.empty(rounds)
+    wagered = np.empty(rounds)
+    for i in range(rounds):
+        game.player.place_bet(bet)
+        net[i] = game.play_hand()
+        wagered[i] = sum(hand.bet for hand in game.player.hands)
+    return net, wagered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate Blackjack rounds with a fixed playing policy.")
+    parser.add_argument("--rounds", type=int, default=1_000_000)
+    parser.add_argument("--policy", default="basic", choices=sorted(POLICIES))
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--penetration", type=float, default=0.75)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    policy = POLICIES[args.policy](args.decks)
+    net, wagered = simulate(args.rounds, policy, args.decks, args.penetration, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"{args.rounds:,} rounds in {elapsed:.1f}s ({args.rounds / elapsed:,.0f} rounds/s)")
+    print(f"EV per round: {net.mean() * 100:+.3f}% of the initial bet "
+          f"(SD {net.std():.3f}, 95% CI +/- {196 * net.std() / np.sqrt(len(net)):.3f}%)")
+    print(f"Return per unit wagered: {net.sum() / wagered.sum() * 100:+.3f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+import argparse
+import os
+from functools import lru_cache
+
+import numpy as np
+
+# Cards are grouped by blackjack value: index 0 is the Ace, 1-8 are 2-9, 9 is every ten-value card
+ACE, TEN = 0, 9
+CARD_POINTS = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+
+# Dealer outcome order in dealer_distribution()
+DEALER_OUTCOMES = (17, 18, 19, 20, 21, 'bust', 'blackjack')
+_BUST, _BLACKJACK = 5, 6
+
+# Table entries: hit, stand, double (else hit), double (else stand), split
+ACTIONS = ('H', 'S', 'D', 'Ds', 'P')
+HIT, STAND, DOUBLE_HIT, DOUBLE_STAND, SPLIT = range(5)
+
+# Table rows: hard 4-21, soft 12-21, then pairs of A, 2, ..., 10
+HARD_ROWS = range(4, 22)
+SOFT_ROWS = range(12, 22)
+NUM_ROWS = len(HARD_ROWS) + len(SOFT_ROWS) + 10
+
+TABLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_tables = {}
+
+
+def card_index(card):
+    """Composition index of a BlackjackCards.Card."""
+    return ACE if card.rank == 'Ace' else card.value - 1
+
+
+def shoe_composition(num_decks):
+    """Cards per composition index in a full shoe."""
+    return (4 * num_decks,) * 9 + (16 * num_decks,)
+
+
+def remove(composition, index):
+    return composition[:index] + (composition[index] - 1,) + composition[index + 1:]
+
+
+def hand_total(cards):
+    """(total, soft) of a list of Cards."""
+    total, soft = 0, False
+    for card in cards:
+        total, soft = add_card(total, soft, card_index(card))
+    return total, soft
+
+
+def add_card(total, soft, index):
+    """(total, soft) after drawing a card; soft means an Ace is counted as 11."""
+    total += CARD_POINTS[index]
+    if index == ACE and not soft and total + 10 <= 21:
+        total += 10
+        soft = True
+    if total > 21 and soft:
+        total -= 10
+        soft = False
+    return total, soft
+
+
+# _DRAWS[total][soft][index] == add_card(total, soft, index) for every total a dealer draws to
+_DRAWS = [[[add_card(total, soft, index) for index in range(10)] for soft in (False, True)]
+          for total in range(17)]
+
+
+def _final(total, num_cards):
+    """DEALER_OUTCOMES index of a dealer standing on total, or None below 17."""
+    if total < 17:
+        return None
+    if total > 21:
+        return _BUST
+    if total == 21 and num_cards == 2:
+        return _BLACKJACK
+    return total - 17
+
+
+# _FINAL[two_cards][total] == _final(total, num_cards)
+_FINAL = [[_final(total, 2 if two_cards else 3) for total in range(27)] for two_cards in (False, True)]
+
+
+@lru_cache(maxsize=200000)
+def _dealer(total, soft, num_cards, composition):
+    # The dealer hits below 17 and stands on every 17, soft or hard
+    probabilities = [0.0] * 7
+    outcome = _final(total, num_cards)
+    if outcome is not None:
+        probabilities[outcome] = 1.0
+        return tuple(probabilities)
+
+    remaining = sum(composition)
+    draws = _DRAWS[total][soft]
+    final = _FINAL[num_cards == 1]
+    for index, count in enumerate(composition):
+        if count:
+            weight = count / remaining
+            new_total, new_soft = draws[index]
+            outcome = final[new_total]
+            if outcome is not None:
+                # A finished hand needs no recursion (or cache lookup)
+                probabilities[outcome] += weight
+            else:
+                sub = _dealer(new_total, new_soft, num_cards + 1, remove(composition, index))
+                for k in range(7):
+                    probabilities[k] += weight * sub[k]
+    return tuple(probabilities)
+
+
+def dealer_distribution(upcard, composition):
+    """
+    Exact probabilities of the dealer's final hand, in DEALER_OUTCOMES order,
+    given the upcard index and the composition of the unseen cards (the hole
+    card is drawn from it). The dealer's draws are removed from the shoe as
+    they happen; results are memoized on the composition.
+    """
+    return _dealer(*add_card(0, False, upcard), 1, tuple(composition))
+
+
+class _HandSolver:
+    """Player EVs against one dealer distribution, drawing from a fixed composition."""
+
+    def __init__(self, dealer, composition):
+        self.dealer = dealer
+        remaining = sum(composition)
+        self.draws = [(index, count / remaining) for index, count in enumerate(composition) if count]
+        self._hit = {}
+
+    def stand(self, total):
+        if total > 21:
+            return -1.0
+        d = self.dealer
+        win = d[_BUST]
+        lose = d[_BLACKJACK]
+        for k in range(5):
+            if 17 + k < total:
+                win += d[k]
+            elif 17 + k > total:
+                lose += d[k]
+        return win - lose
+
+    def hit(self, total, soft):
+        key = (total, soft)
+        if key not in self._hit:
+            ev = 0.0
+            for index, p in self.draws:
+                new_total, new_soft = add_card(total, soft, index)
+                if new_total > 21:
+                    ev -= p
+                else:
+                    ev += p * max(self.stand(new_total), self.hit(new_total, new_soft))
+            self._hit[key] = ev
+        return self._hit[key]
+
+    def double(self, total, soft):
+        return 2 * sum(p * self.stand(add_card(total, soft, index)[0]) for index, p in self.draws)
+
+    def two_card(self, total, soft):
+        """Best of stand/hit/double for a two-card hand; a two-card 21 is a blackjack."""
+        if total == 21:
+            return 1.5 * (1 - self.dealer[_BLACKJACK])
+        return max(self.stand(total), self.hit(total, soft), self.double(total, soft))
+
+    def split(self, pair):
+        """
+        EV of splitting a pair (per original bet), with resplitting and
+        doubling after a split. Ten-value pairs are treated as never resplit,
+        since the ranks of ten-value cards are not tracked.
+        """
+        first = add_card(0, False, pair)
+        same = 0.0
+        other = 0.0
+        for index, p in self.draws:
+            hand = add_card(*first, index)
+            if index == pair and pair != TEN:
+                same = p
+                keep = self.two_card(*hand)
+            else:
+                other += p * self.two_card(*hand)
+        # One split hand is worth E = other + same * max(keep, 2E)
+        ev = other + same * keep if same else other
+        if same and same < 0.5:
+            ev = max(ev, other / (1 - 2 * same))
+        return 2 * ev
+
+
+@lru_cache(maxsize=4096)
+def _solver(upcard, composition):
+    return _HandSolver(dealer_distribution(upcard, composition), composition)
+
+
+def hand_evs(total, soft, upcard, composition, num_cards=2, pair=None):
+    """
+    Composition-dependent EV estimate of each option, per unit of the hand's
+    bet, for a player hand against a dealer upcard, given the composition of
+    the unseen cards. It is not exact: the player's draws use the composition
+    as it stands at the decision and are not removed from the cards the dealer
+    draws, and resplits use the closed form in _HandSolver.split().
+
+    returns: {'s': ..., 'h': ..., 'd': ..., 'p': ...}; 'd' only for two-card
+    hands and 'p' only for pairs (pair = composition index of the paired card).
+    """
+    solver = _solver(upcard, tuple(composition))
+    evs = {'s': solver.stand(total), 'h': solver.hit(total, soft)}
+    if num_cards == 2:
+        evs['d'] = solver.double(total, soft)
+        if pair is not None:
+            evs['p'] = solver.split(pair)
+    return evs
+
+
+def option_evs(hand, dealer_upcard, options, composition):
+    """
+    hand_evs() estimate for each of a BlackjackGame hand's options ('h', 's',
+    'd', 'p'), per unit of the hand's bet, given the composition of the unseen
+    cards (the shoe plus the dealer's hole card).
+    """
+    total, soft = hand_total(hand.cards)
+    pair = card_index(hand.cards[0]) if 'p' in options else None
+    evs = hand_evs(total, soft, card_index(dealer_upcard), composition, len(hand.cards), pair)
+    return {option: evs[option] for option in options if option in evs}
+
+
+def _best_action(evs):
+    best = max(evs, key=evs.get)
+    if best == 'p':
+        return SPLIT
+    if best == 'd':
+        return DOUBLE_HIT if evs['h'] >= evs['s'] else DOUBLE_STAND
+    return HIT if best == 'h' else STAND
+
+
+def build_table(num_decks):
+    """
+    Basic strategy for a full shoe of num_decks decks under BlackjackGame's
+    rules: dealer stands on soft 17 and does not peek, double on any two
+    cards, split and resplit any pair of equal rank, double after split,
+    and a two-card 21 after a split pays 3:2.
+
+    returns: uint8 array (NUM_ROWS, 10) of ACTIONS codes; column = upcard index.
+    """
+    shoe = shoe_composition(num_decks)
+    table = np.zeros((NUM_ROWS, 10), dtype=np.uint8)
+    for upcard in range(10):
+        composition = remove(shoe, upcard)
+        for row, total in enumerate(HARD_ROWS):
+            table[row, upcard] = _best_action(hand_evs(total, False, upcard, composition))
+        for row, total in enumerate(SOFT_ROWS, len(HARD_ROWS)):
+            table[row, upcard] = _best_action(hand_evs(total, True, upcard, composition))
+        for pair in range(10):
+            total, soft = add_card(*add_card(0, False, pair), pair)
+            evs = hand_evs(total, soft, upcard, composition, pair=pair)
+            table[len(HARD_ROWS) + len(SOFT_ROWS) + pair, upcard] = _best_action(evs)
+    return table
+
+
+def table_path(num_decks):
+    return os.path.join(TABLE_DIR, f"basic_strategy_{num_decks}deck.npy")
+
+
+def load_table(num_decks=6):
+    """The table for num_decks: cached, else loaded from disk, else built."""
+    if num_decks not in _tables:
+        path = table_path(num_decks)
+        _tables[num_decks] = np.load(path) if os.path.exists(path) else build_table(num_decks)
+    return _tables[num_decks]
+
+
+def table_action(table, hand, upcard_index, can_split=True):
+    """ACTIONS code for a hand (list of Cards) from a basic strategy table."""
+    if can_split and len(hand.cards) == 2 and hand.cards[0].rank == hand.cards[1].rank:
+        action = table[len(HARD_ROWS) + len(SOFT_ROWS) + card_index(hand.cards[0]), upcard_index]
+        if action == SPLIT:
+            return SPLIT
+    total, soft = hand_total(hand.cards)
+    if soft:
+        return table[len(HARD_ROWS) + total - SOFT_ROWS[0], upcard_index]
+    return table[total - HARD_ROWS[0], upcard_index]
+
+
+def make_basic_strategy_policy(num_decks=6):
+    """A BlackjackGame policy that plays the basic strategy table for num_decks."""
+    table = load_table(num_decks)
+
+    def policy(hand, dealer_upcard, options):
+        action = table_action(table, hand, card_index(dealer_upcard), 'p' in options)
+        if action == SPLIT:
+            return 'p'
+        if action in (DOUBLE_HIT, DOUBLE_STAND) and 'd' in options:
+            return 'd'
+        return 's' if action in (STAND, DOUBLE_STAND) else 'h'
+    return policy
+
+
+def format_table(table):
+    upcards = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'A']
+    columns = list(range(1, 10)) + [ACE]
+    lines = ['       ' + ''.join(f"{u:>4}" for u in upcards)]
+    labels = ([f"H{t}" for t in HARD_ROWS] + [f"S{t}" for t in SOFT_ROWS]
+              + [f"{'A' if p == ACE else CARD_POINTS[p]},{'A' if p == ACE else CARD_POINTS[p]}" for p in range(10)])
+    for row, label in enumerate(labels):
+        lines.append(f"{label:<7}" + ''.join(f"{ACTIONS[table[row, c]]:>4}" for c in columns))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the basic strategy table for BlackjackGame's rules.")
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--save", action="store_true", help="Write the table next to this module")
+    args = parser.parse_args()
+
+    table = build_table(args.decks)
+    print(format_table(table))
+    if args.save:
+        np.save(table_path(args.decks), table)
+        print(f"Saved to {table_path(args.decks)}")
+
+
+if __name__ == "__main__":
+    main()
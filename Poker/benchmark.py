@@ -0,0 +1,168 @@
+# benchmark.py
+#
+# Reproducible micro-benchmarks for the hand evaluators and equity functions.
+# Hand corpora are generated from a fixed seed, so two runs (or two versions
+# of the code) time exactly the same inputs. Each benchmark reports
+# evaluations per second, p50/p99 latency per call and peak memory allocated
+# per call, and the whole run is written to JSON:
+#
+#   python benchmark.py --output bench_new.json --compare bench_old.json
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+from constants import EQUITY_TRIALS
+from equity import calculate_equity, clear_equity_cache, evaluate_batch, monte_carlo_equity
+from handevaluator import check_straight, evaluate, hand_rank, hand_rank_5cards
+from Poker import PokerGame
+
+LATENCY_SAMPLES = 2000
+MEMORY_SAMPLES = 200
+
+
+def make_corpus(seed, hands, spots):
+    """Fixed hands and equity spots for a seed."""
+    rng = random.Random(seed)
+    corpus = {
+        'five': [rng.sample(range(52), 5) for _ in range(hands)],
+        'seven': [rng.sample(range(52), 7) for _ in range(hands)],
+        'spots': [],
+    }
+    corpus['straight_ranks'] = [sorted(((c >> 2) + 2 for c in h), reverse=True) for h in corpus['five']]
+    for i in range(spots):
+        cards = rng.sample(range(52), 7)
+        board_size = (3, 4, 5)[i % 3]
+        corpus['spots'].append((cards[:2], cards[2:2 + board_size], 1 + i % 3))
+    return corpus
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_benchmark(fn, inputs, warmup=100):
+    """
+    Time fn over every input.
+
+    returns: {'calls', 'evals_per_sec', 'p50_us', 'p99_us', 'peak_bytes_per_call'}
+    """
+    for x in inputs[:warmup]:
+        fn(x)
+
+    start = time.perf_counter()
+    for x in inputs:
+        fn(x)
+    elapsed = time.perf_counter() - start
+
+    latencies = []
+    for x in inputs[:LATENCY_SAMPLES]:
+        t = time.perf_counter_ns()
+        fn(x)
+        latencies.append(time.perf_counter_ns() - t)
+    latencies.sort()
+
+    tracemalloc.start()
+    peak_total = 0
+    sample = inputs[:MEMORY_SAMPLES]
+    for x in sample:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn(x)
+        peak_total += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    return {
+        'calls': len(inputs),
+        'evals_per_sec': len(inputs) / elapsed if elapsed else float('inf'),
+        'p50_us': _percentile(latencies, 0.50) / 1000,
+        'p99_us': _percentile(latencies, 0.99) / 1000,
+        'peak_bytes_per_call': peak_total / len(sample),
+    }
+
+
+def run_all(seed=1234, hands=20000, spots=60, trials=EQUITY_TRIALS):
+    corpus = make_corpus(seed, hands, spots)
+    game = PokerGame(equity_trials=trials, equity_seed=seed)
+    batch = [corpus['seven'][i:i + 1000] for i in range(0, len(corpus['seven']), 1000)]
+
+    def uncached_equity(spot):
+        clear_equity_cache()
+        return game.estimate_equity(*spot)
+
+    benchmarks = {
+        'handevaluator.hand_rank': (hand_rank, corpus['seven']),
+        'handevaluator.hand_rank_5cards': (hand_rank_5cards, corpus['five']),
+        'handevaluator.check_straight': (check_straight, corpus['straight_ranks']),
+        'handevaluator.evaluate': (evaluate, corpus['seven']),
+        'PokerGame.hand_rank': (game.hand_rank, corpus['five']),
+        'PokerGame.best_hand_score': (lambda h: game.best_hand_score(h[:2], h[2:]), corpus['seven']),
+        'PokerGame.estimate_equity': (uncached_equity, corpus['spots']),
+        'equity.calculate_equity': (lambda s: calculate_equity(*s, trials=trials, seed=seed), corpus['spots']),
+        'equity.monte_carlo_equity': (lambda s: monte_carlo_equity(*s, trials=trials, seed=seed), corpus['spots']),
+    }
+    results = {}
+    for name, (fn, inputs) in benchmarks.items():
+        warmup = 100 if len(inputs) > 1000 else 2
+        results[name] = run_benchmark(fn, inputs, warmup)
+        print(f"{name:<32}{results[name]['evals_per_sec']:>14,.0f}/s  p50 {results[name]['p50_us']:>10.1f}us"
+              f"  p99 {results[name]['p99_us']:>10.1f}us  {results[name]['peak_bytes_per_call']:>10,.0f} B/call")
+
+    # evaluate_batch scores 1000 hands per call; report hands per second
+    name = 'equity.evaluate_batch'
+    results[name] = run_benchmark(evaluate_batch, batch, warmup=1)
+    results[name]['evals_per_sec'] *= 1000
+    print(f"{name:<32}{results[name]['evals_per_sec']:>14,.0f}/s  (hands, 1000 per call)")
+    return results
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(new, old):
+    """Print the throughput change of every benchmark present in both runs."""
+    print(f"\nvs {old.get('revision')} ({old.get('timestamp')}):")
+    for name, row in new['results'].items():
+        if name in old['results']:
+            ratio = row['evals_per_sec'] / old['results'][name]['evals_per_sec']
+            print(f"{name:<32}{ratio:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hand evaluators and equity functions.")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--hands", type=int, default=20000, help="Hands per evaluator corpus")
+    parser.add_argument("--spots", type=int, default=60, help="Equity decisions in the equity corpus")
+    parser.add_argument("--trials", type=int, default=EQUITY_TRIALS, help="Monte Carlo trials per equity decision")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="A previous results file to compare against")
+    args = parser.parse_args()
+
+    run = {
+        'revision': _git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'params': {'seed': args.seed, 'hands': args.hands, 'spots': args.spots, 'trials': args.trials},
+        'results': run_all(args.seed, args.hands, args.spots, args.trials),
+    }
+    with open(args.output, 'w') as f:
+        json.dump(run, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(run, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,32 @@
 import random
 from handevaluator import hand_rank
-from deck import RANKS
+from preflop import MAX_OPPONENTS, preflop_equity, representative_hand, starting_hand_name
 
-def bot_decision(bot_player, community_cards, call_amount, pot_size, round_name):
+# Preflop tiers by equity relative to a fair share of the pot (1 / players in hand).
+# Heads-up, with preflop_equity.npy, the tiers hold 4 / 12 / 7 hands, close to the
+# 4 / 11 / 6 of the old string tiers but not the same hands:
+#   premium AA-JJ                                 (was AA-JJ)
+#   good    TT-77, AKs-ATs, AKo-AJo, KQs          (was TT-88, AK, AQ, AJ, KQ)
+#   medium  66, A9s, A8s, KJs, KTs, ATo, KQo      (was 77-22)
+PREMIUM_SHARE = 1.52
+GOOD_SHARE = 1.27
+MEDIUM_SHARE = 1.23
+
+TIERS = ('premium', 'good', 'medium', 'weak')
+
+def bot_decision(bot_player, community_cards, call_amount, pot_size, round_name,
+                 equity_service=None, num_opponents=1):
+    # With an EquityService the postflop equity is simulated against
+    # num_opponents random hands instead of bucketed from the made-hand rank.
     full_hand = bot_player.hole_cards + community_cards
     stack = bot_player.stack
     num_cards = len(full_hand)
 
     if num_cards < 5:
-        return preflop_decision(bot_player, community_cards, call_amount, pot_size, round_name)
+        return preflop_decision(bot_player, community_cards, call_amount, pot_size, round_name, num_opponents)
+    elif equity_service is not None:
+        equity, _ = equity_service.equity(bot_player.hole_cards, community_cards, num_opponents)
+        return postflop_decision(bot_player, equity, call_amount, pot_size, round_name)
     else:
         strength_tuple = hand_rank(full_hand)
         equity = estimate_equity_from_rank(strength_tuple)
@@ -37,15 +55,30 @@ def estimate_equity_from_rank(rank_tuple):
     else:
         return 0.25
 
-def preflop_decision(bot_player, community_cards, call_amount, pot_size, round_name):
-    hole_cards = bot_player.hole_cards
-    ranks = sorted([c[0] for c in hole_cards], key=lambda x: RANKS.index(x))
-    hole_str = "".join(ranks)
-    premium = hole_str in ["AA", "KK", "QQ", "JJ"]
-    good = hole_str in ["TT","99","88","AK","AQ","AJ","KQ"]
-    mid_pairs = ["77","66","55","44","33","22"]
-    medium = hole_str in mid_pairs
-    weak = not(premium or good or medium)
+def preflop_tier(hole_cards, num_opponents=1):
+    num_opponents = min(max(num_opponents, 1), MAX_OPPONENTS)
+    share = preflop_equity(hole_cards, num_opponents) * (num_opponents + 1)
+    if share >= PREMIUM_SHARE:
+        return 'premium'
+    if share >= GOOD_SHARE:
+        return 'good'
+    if share >= MEDIUM_SHARE:
+        return 'medium'
+    return 'weak'
+
+def tier_ranges(num_opponents=1):
+    """Canonical hand names ('AKs', ...) in each tier against num_opponents."""
+    ranges = {tier: [] for tier in TIERS}
+    for index in range(169):
+        ranges[preflop_tier(representative_hand(index), num_opponents)].append(starting_hand_name(index))
+    return ranges
+
+def preflop_decision(bot_player, community_cards, call_amount, pot_size, round_name, num_opponents=1):
+    tier = preflop_tier(bot_player.hole_cards, num_opponents)
+    premium = tier == 'premium'
+    good = tier == 'good'
+    medium = tier == 'medium'
+    weak = tier == 'weak'
 
     stack = bot_player.stack
 
@@ -159,3 +192,14 @@ def postflop_decision(bot_player, equity, call_amount, pot_size, round_name):
                 return ('raise', raise_amt)
             else:
                 return ('fold', 0)
+
+def main():
+    # Lists every preflop tier against 1..MAX_OPPONENTS opponents
+    for num_opponents in range(1, MAX_OPPONENTS + 1):
+        ranges = tier_ranges(num_opponents)
+        print(f"{num_opponents} opponent(s): " + ", ".join(f"{tier} {len(ranges[tier])}" for tier in TIERS))
+        for tier in TIERS[:-1]:
+            print(f"  {tier:<8}" + " ".join(ranges[tier]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# cards.py
+#
+# Cards are plain ints 0..51: rank_index * 4 + suit_index, with rank_index
+# 0..12 for '2'..'A' and suit_index 0..3 for SUITS. Everything inside the
+# game (Deck, Player.hole_cards, the evaluators) works on these ints;
+# strings only appear when printing or reading input.
+
+from itertools import permutations
+
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
+SUITS = ['♠', '♥', '♦', '♣']
+SUIT_LETTERS = ['S', 'H', 'D', 'C']
+
+FULL_DECK = tuple(range(52))
+CARD_STRS = tuple(r + s for r in RANKS for s in SUITS)
+
+_PARSE = {}
+for _i, _r in enumerate(RANKS):
+    for _j in range(4):
+        for _rank_text in (('T', '10') if _r == 'T' else (_r,)):
+            _PARSE[_rank_text + SUITS[_j]] = _i * 4 + _j
+            _PARSE[_rank_text + SUIT_LETTERS[_j]] = _i * 4 + _j
+
+
+def make_card(rank_index, suit_index):
+    return rank_index * 4 + suit_index
+
+
+def card_rank(card):
+    """Rank index 0..12 ('2'..'A')."""
+    return card >> 2
+
+
+def card_suit(card):
+    return card & 3
+
+
+def card_str(card):
+    return CARD_STRS[card]
+
+
+def cards_str(cards):
+    return ', '.join(CARD_STRS[c] for c in cards)
+
+
+# One card-relabelling table per permutation of the four suits
+_SUIT_PERMUTATIONS = [tuple((c & ~3) | perm[c & 3] for c in range(52)) for perm in permutations(range(4))]
+
+
+def canonical_key(hole_cards, board_cards):
+    """
+    Canonical form of (hole, board) under suit relabelling: all holdings that
+    differ only by a permutation of suits (AhKh/Qh7c2d vs AsKs/Qs7d2c) map to the
+    same key. The key is itself a valid (hole, board) pair of sorted card tuples.
+    """
+    return min(
+        (tuple(sorted(t[c] for c in hole_cards)), tuple(sorted(t[c] for c in board_cards)))
+        for t in _SUIT_PERMUTATIONS
+    )
+
+
+def parse_card(text):
+    """
+    Parse a card such as 'AH', 'a♥', 'Td' or '10s' into its int encoding.
+    Raises ValueError for anything else.
+    """
+    card = _PARSE.get(text.strip().upper())
+    if card is None:
+        raise ValueError(f"Invalid card: {text!r}")
+    return card
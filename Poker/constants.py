@@ -1,4 +1,7 @@
 # constants.py
 INITIAL_STACK = 1000  # Starting stack for each player
 BIG_BLIND = 10
-SMALL_BLIND = 5
\ No newline at end of file
+SMALL_BLIND = 5
+EQUITY_TRIALS = 10000  # Monte Carlo trials per equity estimate
+EXACT_EQUITY_LIMIT = 100000  # Enumerate equity exactly when runouts x opponent holdings fit under this
+EQUITY_CACHE_SIZE = 100000  # Suit-canonical spots kept by equity.cached_equity
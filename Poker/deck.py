@@ -1,15 +1,13 @@
 # deck.py
 import random
 
-SUITS = ['♥', '♦', '♣', '♠']
-RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
+from cards import FULL_DECK
 
 
 class Deck:
     def __init__(self):
-        self.cards = [r + s[0] for s in SUITS for r in RANKS]
-        # Alternative format: ('2 of Hearts', '2H') etc.
-        # We'll use short form like 'AH' for Ace of Hearts.
+        # Cards are ints 0..51 (see cards.py); use card_str() to display them.
+        self.cards = list(FULL_DECK)
 
     def shuffle(self):
         random.shuffle(self.cards)
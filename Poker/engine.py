@@ -0,0 +1,296 @@
+# engine.py
+#
+# Headless no-limit hold'em hand engine. A HandEngine plays one hand as a
+# state machine: ask legal_actions() / state() for the seat in to_act,
+# feed its choice to apply_action(), repeat until hand_over. Nothing is
+# printed or read; an optional observer(event, data) callable receives a
+# structured event for every blind, card, action and payout, which is how
+# the console front ends (game.py, Poker.py) render a hand.
+
+import random
+
+from cards import FULL_DECK
+from constants import BIG_BLIND, SMALL_BLIND
+from handevaluator import evaluate
+
+STREETS = ('preflop', 'flop', 'turn', 'river')
+FOLD, CHECK, CALL, BET, RAISE = 'fold', 'check', 'call', 'bet', 'raise'
+_BOARD_CARDS = (0, 3, 1, 1)  # cards dealt when each street opens
+
+
+class HandEngine:
+    def __init__(self, stacks, dealer=0, small_blind=SMALL_BLIND, big_blind=BIG_BLIND,
+                 rng=None, deck=None, observer=None):
+        """
+        stacks: chips per seat; seats with 0 chips sit the hand out.
+        dealer: seat index of the button.
+        rng: random.Random used to shuffle (default: the random module).
+        deck: optional list of card ints to deal from, top card first; skips the shuffle.
+        observer: optional callable observer(event, data) for structured events.
+        """
+        self.num_seats = len(stacks)
+        self.stacks = list(stacks)
+        self.dealer = dealer
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.observer = observer
+
+        self.in_hand = [s > 0 for s in self.stacks]
+        if sum(self.in_hand) < 2:
+            raise ValueError("A hand needs at least two seats with chips.")
+        self.folded = [not seated for seated in self.in_hand]
+        self.hole_cards = [[] for _ in range(self.num_seats)]
+        self.board = []
+        self.contributed = [0] * self.num_seats  # chips put in over the whole hand
+        self.street_bets = [0] * self.num_seats  # chips put in on the current street
+        self.current_bet = 0
+        self.min_raise = big_blind
+        self.street = 0
+        self.to_act = None
+        self.pending = set()
+        self.hand_over = False
+        self.winnings = [0] * self.num_seats  # chips awarded at the end of the hand
+
+        if deck is None:
+            deck = list(FULL_DECK)
+            (rng or random).shuffle(deck)
+        # Deal by popping from the end
+        self._deck = list(reversed(deck))
+        self._start()
+
+    # ---- public API -------------------------------------------------------
+
+    @property
+    def pot(self):
+        return sum(self.contributed)
+
+    @property
+    def street_name(self):
+        return STREETS[self.street]
+
+    def call_amount(self, seat=None):
+        seat = self.to_act if seat is None else seat
+        return min(self.current_bet - self.street_bets[seat], self.stacks[seat])
+
+    def legal_actions(self):
+        """
+        Legal moves for the seat in to_act as (action, min_amount, max_amount).
+        For bet/raise the amounts are the seat's total street bet after the action
+        ("raise to"); for call they are the chips the call puts in.
+        """
+        if self.hand_over:
+            return []
+        seat = self.to_act
+        to_call = self.current_bet - self.street_bets[seat]
+        stack = self.stacks[seat]
+        if to_call > 0:
+            actions = [(FOLD, 0, 0), (CALL, min(to_call, stack), min(to_call, stack))]
+        else:
+            actions = [(FOLD, 0, 0), (CHECK, 0, 0)]
+
+        others_can_act = any(s != seat and not self.folded[s] and self.stacks[s] > 0
+                             for s in range(self.num_seats))
+        if stack > to_call and others_can_act:
+            all_in_to = self.street_bets[seat] + stack
+            if self.current_bet == 0:
+                actions.append((BET, min(self.big_blind, all_in_to), all_in_to))
+            else:
+                actions.append((RAISE, min(self.current_bet + self.min_raise, all_in_to), all_in_to))
+        return actions
+
+    def state(self, seat=None):
+        """
+        Snapshot of the hand as seen by `seat` (default: the seat to act).
+        Only that seat's hole cards are included.
+        """
+        seat = self.to_act if seat is None else seat
+        state = {
+            'street': self.street_name,
+            'board': list(self.board),
+            'pot': self.pot,
+            'dealer': self.dealer,
+            'big_blind': self.big_blind,
+            'stacks': list(self.stacks),
+            'street_bets': list(self.street_bets),
+            'folded': list(self.folded),
+            'current_bet': self.current_bet,
+            'num_active': sum(not f for f in self.folded),
+            'to_act': self.to_act,
+            'seat': seat,
+        }
+        if seat is not None:
+            state['hole_cards'] = list(self.hole_cards[seat])
+            state['stack'] = self.stacks[seat]
+            state['call_amount'] = self.call_amount(seat)
+            state['legal_actions'] = self.legal_actions() if seat == self.to_act else []
+        return state
+
+    def apply_action(self, action, amount=0):
+        """
+        Apply the to_act seat's move. 'bet' and 'raise' are interchangeable and take
+        the total street bet to raise to; it is clamped into the legal range, so an
+        all-in short of a full raise is allowed. A bet/raise that isn't available
+        becomes a call (or check), and 'call' with nothing to call checks.
+        Raises ValueError for a move that isn't legal here.
+        """
+        if self.hand_over:
+            raise ValueError("The hand is over.")
+        seat = self.to_act
+        legal = {name: (lo, hi) for name, lo, hi in self.legal_actions()}
+        if action == CALL and CALL not in legal:
+            action = CHECK
+        elif action in (BET, RAISE):
+            if BET in legal:
+                action = BET
+            elif RAISE in legal:
+                action = RAISE
+            else:
+                action = CALL if CALL in legal else CHECK
+        if action not in legal:
+            raise ValueError(f"Illegal action {action!r}; legal: {sorted(legal)}")
+
+        put = 0
+        if action == FOLD:
+            self.folded[seat] = True
+            self.pending.discard(seat)
+        elif action == CHECK:
+            self.pending.discard(seat)
+        elif action == CALL:
+            put = self._put(seat, legal[CALL][0])
+            self.pending.discard(seat)
+        else:
+            lo, hi = legal[action]
+            target = min(max(amount, lo), hi)
+            put = self._put(seat, target - self.street_bets[seat])
+            raise_size = self.street_bets[seat] - self.current_bet
+            self.min_raise = max(self.min_raise, raise_size)
+            self.current_bet = self.street_bets[seat]
+            # Any raise, even a short all-in, reopens the action for everyone else
+            self.pending = {s for s in range(self.num_seats)
+                            if s != seat and not self.folded[s] and self.stacks[s] > 0}
+
+        self._emit('action', seat=seat, action=action, amount=put,
+                   street_bet=self.street_bets[seat], stack=self.stacks[seat], pot=self.pot)
+        self._advance(seat)
+
+    def net_results(self, starting_stacks):
+        """Chips won or lost per seat relative to starting_stacks."""
+        return [end - start for end, start in zip(self.stacks, starting_stacks)]
+
+    # ---- internals --------------------------------------------------------
+
+    def _emit(self, event, **data):
+        if self.observer is not None:
+            self.observer(event, data)
+
+    def _next_seat(self, seat, seats):
+        for step in range(1, self.num_seats + 1):
+            candidate = (seat + step) % self.num_seats
+            if candidate in seats:
+                return candidate
+        return None
+
+    def _put(self, seat, chips):
+        chips = min(chips, self.stacks[seat])
+        self.stacks[seat] -= chips
+        self.street_bets[seat] += chips
+        self.contributed[seat] += chips
+        return chips
+
+    def _start(self):
+        seated = {s for s in range(self.num_seats) if self.in_hand[s]}
+        self._emit('hand_start', dealer=self.dealer, stacks=list(self.stacks))
+
+        if len(seated) == 2:
+            # Heads-up the button posts the small blind
+            sb = self.dealer if self.dealer in seated else self._next_seat(self.dealer, seated)
+        else:
+            sb = self._next_seat(self.dealer, seated)
+        bb = self._next_seat(sb, seated)
+        for seat, blind, kind in ((sb, self.small_blind, 'small'), (bb, self.big_blind, 'big')):
+            posted = self._put(seat, blind)
+            self._emit('blind', seat=seat, kind=kind, amount=posted, pot=self.pot)
+        self.current_bet = max(self.street_bets)
+
+        for _ in range(2):
+            seat = sb
+            for _ in range(len(seated)):
+                self.hole_cards[seat].append(self._deck.pop())
+                seat = self._next_seat(seat, seated)
+        for seat in sorted(seated):
+            self._emit('hole_cards', seat=seat, cards=list(self.hole_cards[seat]))
+
+        self._open_round(self._next_seat(bb, seated))
+
+    def _open_round(self, first):
+        # Everyone who still has chips acts, unless a lone player has nothing to call
+        can_act = {s for s in range(self.num_seats) if not self.folded[s] and self.stacks[s] > 0}
+        if len(can_act) == 1:
+            (seat,) = can_act
+            if self.street_bets[seat] >= self.current_bet:
+                can_act = set()
+        self.pending = can_act
+        if not can_act:
+            self._advance(None)
+        else:
+            self.to_act = first if first in can_act else self._next_seat(first, can_act)
+
+    def _advance(self, last_seat):
+        contenders = [s for s in range(self.num_seats) if not self.folded[s]]
+        if len(contenders) == 1:
+            self._award_uncontested(contenders[0])
+            return
+        if self.pending:
+            self.to_act = self._next_seat(last_seat, self.pending)
+            return
+        if self.street == 3:
+            self._showdown(contenders)
+            return
+
+        self.street += 1
+        self.street_bets = [0] * self.num_seats
+        self.current_bet = 0
+        self.min_raise = self.big_blind
+        for _ in range(_BOARD_CARDS[self.street]):
+            self.board.append(self._deck.pop())
+        self._emit('street', street=self.street_name, board=list(self.board), pot=self.pot)
+        self.to_act = None
+        self._open_round(self._next_seat(self.dealer, set(contenders)))
+
+    def _award_uncontested(self, seat):
+        self.winnings[seat] = self.pot
+        self.stacks[seat] += self.pot
+        self._emit('pot_awarded', seats=[seat], amount=self.pot, uncontested=True)
+        self._finish()
+
+    def _showdown(self, contenders):
+        scores = {s: evaluate(self.hole_cards[s] + self.board) for s in contenders}
+        self._emit('showdown', board=list(self.board),
+                   hands={s: (list(self.hole_cards[s]), scores[s]) for s in contenders})
+
+        # Side pots: one layer per distinct all-in level among the contenders
+        levels = sorted({self.contributed[s] for s in contenders})
+        previous = 0
+        for i, level in enumerate(levels):
+            top = i == len(levels) - 1
+            layer = sum(min(c, level) - min(c, previous) if not top else c - min(c, previous)
+                        for c in self.contributed)
+            eligible = [s for s in contenders if self.contributed[s] >= level]
+            best = max(scores[s] for s in eligible)
+            winners = [s for s in eligible if scores[s] == best]
+            share, odd = divmod(layer, len(winners))
+            # Odd chips go to the first winner left of the button
+            ordered = sorted(winners, key=lambda s: (s - self.dealer - 1) % self.num_seats)
+            for j, s in enumerate(ordered):
+                won = share + (odd if j == 0 else 0)
+                self.winnings[s] += won
+                self.stacks[s] += won
+            self._emit('pot_awarded', seats=ordered, amount=layer, uncontested=False)
+            previous = level
+        self._finish()
+
+    def _finish(self):
+        self.hand_over = True
+        self.to_act = None
+        self.pending = set()
+        self._emit('hand_end', stacks=list(self.stacks), winnings=list(self.winnings))
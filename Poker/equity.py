@@ -0,0 +1,273 @@
+# equity.py
+#
+# Batched equity calculation. Boards and opponent holdings for many trials
+# are drawn at once as NumPy arrays and every hand is scored with
+# evaluate_batch(), which returns the same ints as handevaluator.evaluate().
+# Small spots (typically heads-up on the turn or river) are enumerated
+# exactly instead of sampled, and cached_equity() memoizes results per
+# suit-isomorphic spot.
+
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from cards import FULL_DECK, canonical_key
+from constants import EQUITY_CACHE_SIZE, EQUITY_TRIALS, EXACT_EQUITY_LIMIT
+from handevaluator import CATEGORY_SHIFT, FLUSH_SCORE, POPCOUNT, STRAIGHT_HIGH
+
+# Trials scored per NumPy pass; bounds memory regardless of the trial count
+CHUNK_SIZE = 20000
+
+_POPCOUNT = np.array(POPCOUNT, dtype=np.int64)
+_STRAIGHT_HIGH = np.array(STRAIGHT_HIGH, dtype=np.int64)
+_FLUSH_SCORE = np.array(FLUSH_SCORE, dtype=np.int64)
+# Highest rank (2..14) present in a 13-bit rank mask, 0 for an empty mask
+_HIGH_RANK = np.zeros(1 << 13, dtype=np.int64)
+for _bit in range(13):
+    _HIGH_RANK[1 << _bit:1 << (_bit + 1)] = _bit + 2
+# Mask bit of a rank value; index 0 (no rank) maps to no bit
+_RANK_BIT = np.array([0, 0] + [1 << b for b in range(13)], dtype=np.int64)
+_RANK_SHIFTS = 3 * np.arange(13, dtype=np.int64)
+_POW2 = 1 << np.arange(13, dtype=np.int64)
+
+
+def _pack(category, *ranks):
+    score = np.int64(category) << CATEGORY_SHIFT
+    for i, r in enumerate(ranks):
+        score = score | (r << (16 - 4 * i))
+    return score
+
+
+def _top(mask, n):
+    # Highest n ranks of each mask, as n arrays (0 where the mask runs out)
+    ranks = []
+    for _ in range(n):
+        r = _HIGH_RANK[mask]
+        ranks.append(r)
+        mask = mask & ~_RANK_BIT[r]
+    return ranks
+
+
+def evaluate_batch(cards):
+    """
+    Score many hands at once.
+
+    cards: int array of shape (N, k), 5 <= k <= 7, one hand per row.
+    returns: int64 array of shape (N,) matching handevaluator.evaluate().
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    ranks = cards >> 2
+    suits = cards & 3
+    bits = np.int64(1) << ranks
+
+    key = (np.int64(1) << (3 * ranks)).sum(axis=1)
+    counts = (key[:, None] >> _RANK_SHIFTS) & 7
+    present = np.bitwise_or.reduce(bits, axis=1)
+    quads = ((counts == 4) * _POW2).sum(axis=1)
+    trips = ((counts == 3) * _POW2).sum(axis=1)
+    pairs = ((counts == 2) * _POW2).sum(axis=1)
+
+    flush_mask = np.zeros(len(cards), dtype=np.int64)
+    for s in range(4):
+        suit_mask = np.bitwise_or.reduce(np.where(suits == s, bits, 0), axis=1)
+        flush_mask = np.where(_POPCOUNT[suit_mask] >= 5, suit_mask, flush_mask)
+
+    q = _HIGH_RANK[quads]
+    t = _HIGH_RANK[trips]
+    p1, p2 = _top(pairs, 2)
+    straight = _STRAIGHT_HIGH[present]
+
+    return np.select(
+        [
+            # With at most 7 cards a flush rules out quads and full houses
+            flush_mask != 0,
+            quads != 0,
+            (trips != 0) & ((pairs != 0) | (_POPCOUNT[trips] > 1)),
+            straight != 0,
+            trips != 0,
+            p2 != 0,
+            p1 != 0,
+        ],
+        [
+            _FLUSH_SCORE[flush_mask],
+            _pack(7, q, *_top(present & ~_RANK_BIT[q], 1)),
+            _pack(6, t, *_top((trips | pairs) & ~_RANK_BIT[t], 1)),
+            _pack(4, straight),
+            _pack(3, t, *_top(present & ~_RANK_BIT[t], 2)),
+            _pack(2, p1, p2, *_top(present & ~_RANK_BIT[p1] & ~_RANK_BIT[p2], 1)),
+            _pack(1, p1, *_top(present & ~_RANK_BIT[p1], 3)),
+        ],
+        default=_pack(0, *_top(present, 5)),
+    )
+
+
+def _draw(rng, remaining, n, k):
+    # k distinct cards per trial, in random order: the k smallest of n x len(remaining)
+    # uniform keys, then sorted by key so the slot a card lands in is also uniform.
+    keys = rng.random((n, len(remaining)))
+    picked = np.argpartition(keys, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(keys, picked, axis=1), axis=1)
+    return remaining[np.take_along_axis(picked, order, axis=1)]
+
+
+def monte_carlo_counts(hole_cards, community_cards, num_opponents, trials=EQUITY_TRIALS, seed=None):
+    """
+    Play out `trials` random boards and opponent holdings.
+
+    seed: anything np.random.default_rng accepts (int, SeedSequence, Generator, None).
+    returns: (wins, ties, trials) for the hero against the best opponent hand.
+    """
+    rng = np.random.default_rng(seed)
+    dead = set(hole_cards) | set(community_cards)
+    remaining = np.array([c for c in FULL_DECK if c not in dead], dtype=np.int64)
+    board_needed = 5 - len(community_cards)
+    k = board_needed + 2 * num_opponents
+
+    hole = np.array(hole_cards, dtype=np.int64)
+    board = np.array(community_cards, dtype=np.int64)
+    wins = ties = 0
+    for start in range(0, trials, CHUNK_SIZE):
+        n = min(CHUNK_SIZE, trials - start)
+        drawn = _draw(rng, remaining, n, k)
+        boards = np.concatenate([np.broadcast_to(board, (n, len(board))), drawn[:, :board_needed]], axis=1)
+
+        hero = evaluate_batch(np.concatenate([np.broadcast_to(hole, (n, 2)), boards], axis=1))
+        opp_holes = drawn[:, board_needed:].reshape(n, num_opponents, 2)
+        opp_hands = np.concatenate(
+            [opp_holes, np.broadcast_to(boards[:, None, :], (n, num_opponents, 5))], axis=2
+        ).reshape(n * num_opponents, 7)
+        best_opp = evaluate_batch(opp_hands).reshape(n, num_opponents).max(axis=1)
+
+        wins += int(np.count_nonzero(hero > best_opp))
+        ties += int(np.count_nonzero(hero == best_opp))
+    return wins, ties, trials
+
+
+def equity_from_counts(wins, ties, trials):
+    """
+    Equity (a tie counts as half a win) and its standard error.
+
+    returns: (equity, std_error)
+    """
+    if trials == 0:
+        return 0.0, 0.0
+    equity = (wins + ties / 2) / trials
+    second_moment = (wins + ties / 4) / trials
+    variance = max(second_moment - equity * equity, 0.0)
+    return equity, (variance / trials) ** 0.5
+
+
+def monte_carlo_equity(hole_cards, community_cards, num_opponents, trials=EQUITY_TRIALS, seed=None):
+    """
+    Estimate the hero's equity against `num_opponents` random hands.
+
+    returns: (equity, std_error)
+    """
+    if num_opponents == 0:
+        return 1.0, 0.0
+    return equity_from_counts(*monte_carlo_counts(hole_cards, community_cards, num_opponents, trials, seed))
+
+
+def enumeration_size(hole_cards, community_cards, num_opponents):
+    """Number of (runout, opponent holdings) combinations exact_counts() would score."""
+    unseen = 52 - len(hole_cards) - len(community_cards)
+    size = comb(unseen, 5 - len(community_cards))
+    unseen -= 5 - len(community_cards)
+    for _ in range(num_opponents):
+        size *= comb(unseen, 2)
+        unseen -= 2
+    return size
+
+
+def _combos(cards, k):
+    combos = list(combinations(cards, k))
+    combos = np.array(combos, dtype=np.int64).reshape(len(combos), k)
+    # Cards in a combination are distinct, so summing their bits ORs them
+    return combos, (np.int64(1) << combos).sum(axis=1)
+
+
+def exact_counts(hole_cards, community_cards, num_opponents):
+    """
+    Score every remaining runout against every combination of opponent holdings.
+    Keep enumeration_size() in mind: the work grows with it linearly.
+
+    returns: (wins, ties, total) in the same form as monte_carlo_counts().
+    """
+    dead = set(hole_cards) | set(community_cards)
+    remaining = [c for c in FULL_DECK if c not in dead]
+    runouts, used = _combos(remaining, 5 - len(community_cards))
+    hands, hand_masks = _combos(remaining, 2)
+
+    # Cross runouts with each opponent's holdings in turn, dropping rows that reuse a card
+    run_idx = np.arange(len(runouts))
+    opp_idx = []
+    for _ in range(num_opponents):
+        run_idx = np.repeat(run_idx, len(hands))
+        opp_idx = [np.repeat(idx, len(hands)) for idx in opp_idx]
+        new_idx = np.tile(np.arange(len(hands)), len(used))
+        used = np.repeat(used, len(hands))
+        keep = (used & hand_masks[new_idx]) == 0
+        run_idx, used, new_idx = run_idx[keep], used[keep] | hand_masks[new_idx[keep]], new_idx[keep]
+        opp_idx = [idx[keep] for idx in opp_idx] + [new_idx]
+
+    board = np.array(community_cards, dtype=np.int64)
+    boards = np.concatenate([np.broadcast_to(board, (len(runouts), len(board))), runouts], axis=1)
+    hole = np.array(hole_cards, dtype=np.int64)
+    hero_by_runout = evaluate_batch(np.concatenate([np.broadcast_to(hole, (len(boards), 2)), boards], axis=1))
+
+    hero = hero_by_runout[run_idx]
+    best_opp = np.full(len(run_idx), -1, dtype=np.int64)
+    for idx in opp_idx:
+        best_opp = np.maximum(best_opp, evaluate_batch(np.concatenate([hands[idx], boards[run_idx]], axis=1)))
+
+    wins = int(np.count_nonzero(hero > best_opp))
+    ties = int(np.count_nonzero(hero == best_opp))
+    return wins, ties, len(run_idx)
+
+
+def calculate_equity(hole_cards, community_cards, num_opponents, trials=EQUITY_TRIALS,
+                     exact_limit=EXACT_EQUITY_LIMIT, seed=None):
+    """
+    Hero equity against `num_opponents` random hands. Enumerates exactly when
+    enumeration_size() is at most exact_limit (std_error is then 0.0),
+    otherwise runs `trials` Monte Carlo trials.
+
+    returns: (equity, std_error)
+    """
+    if num_opponents == 0:
+        return 1.0, 0.0
+    if enumeration_size(hole_cards, community_cards, num_opponents) <= exact_limit:
+        equity, _ = equity_from_counts(*exact_counts(hole_cards, community_cards, num_opponents))
+        return equity, 0.0
+    return monte_carlo_equity(hole_cards, community_cards, num_opponents, trials, seed)
+
+
+@lru_cache(maxsize=EQUITY_CACHE_SIZE)
+def _equity_for_key(key, num_opponents, trials, exact_limit, seed):
+    hole_cards, community_cards = key
+    return calculate_equity(list(hole_cards), list(community_cards), num_opponents, trials, exact_limit, seed)
+
+
+def cached_equity(hole_cards, community_cards, num_opponents, trials=EQUITY_TRIALS,
+                  exact_limit=EXACT_EQUITY_LIMIT, seed=None):
+    """
+    calculate_equity() behind an LRU cache keyed on the suit-canonical spot
+    (cards.canonical_key) and the opponent count, so spots that only differ
+    by suits are computed once. A cached Monte Carlo estimate is reused as is.
+    With an int seed the Monte Carlo estimate is reproducible.
+
+    returns: (equity, std_error)
+    """
+    key = canonical_key(hole_cards, community_cards)
+    return _equity_for_key(key, num_opponents, trials, exact_limit, seed)
+
+
+def equity_cache_info():
+    """hits, misses, maxsize and currsize of the cached_equity() cache."""
+    return _equity_for_key.cache_info()
+
+
+def clear_equity_cache():
+    _equity_for_key.cache_clear()
@@ -0,0 +1,113 @@
+# equity_service.py
+#
+# Multi-core equity: Monte Carlo trials are split into batches that run on
+# a ProcessPoolExecutor, each batch with its own RNG stream spawned from one
+# SeedSequence, and the win/tie counts are merged. The pool is started once
+# and reused for every decision.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from constants import EQUITY_TRIALS, EXACT_EQUITY_LIMIT
+from equity import (enumeration_size, equity_from_counts, evaluate_batch, exact_counts,
+                    monte_carlo_counts)
+
+# Default floor on trials per batch: about 5 ms of work, well above the
+# per-task overhead, so EQUITY_TRIALS still spreads over up to 10 workers
+MIN_BATCH_TRIALS = 1000
+
+
+def _warm_worker():
+    # Import NumPy and the evaluator tables before the first real batch arrives
+    evaluate_batch(np.arange(7).reshape(1, 7))
+
+
+def _ping(_):
+    return os.getpid()
+
+
+class EquityService:
+    def __init__(self, max_workers=None, seed=None, min_batch_trials=MIN_BATCH_TRIALS):
+        """
+        max_workers: worker processes (default: all cores).
+        seed: seeds the SeedSequence every batch stream is spawned from. With the same
+              seed, worker count and sequence of calls, results are reproducible.
+        min_batch_trials: smallest batch handed to a worker; trials are otherwise
+              split evenly over the workers.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_batch_trials = min_batch_trials
+        self._seed_seq = np.random.SeedSequence(seed)
+        self._executor = None
+
+    def start(self):
+        """Start every worker now rather than on the first decision."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_warm_worker)
+            # The executor spawns processes on demand; one task per worker brings them all up
+            list(self._executor.map(_ping, range(self.max_workers)))
+        return self
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+    def counts(self, hole_cards, community_cards, num_opponents, trials=EQUITY_TRIALS):
+        """
+        Run `trials` Monte Carlo trials across the pool.
+
+        returns: (wins, ties, trials) merged over all batches.
+        """
+        self.start()
+        batch = max(self.min_batch_trials, -(-trials // self.max_workers))
+        sizes = [min(batch, trials - start) for start in range(0, trials, batch)]
+        seeds = self._seed_seq.spawn(len(sizes))
+        futures = [
+            self._executor.submit(monte_carlo_counts, hole_cards, community_cards, num_opponents, size, seed)
+            for size, seed in zip(sizes, seeds)
+        ]
+        wins = ties = 0
+        for future in futures:
+            w, t, _ = future.result()
+            wins += w
+            ties += t
+        return wins, ties, trials
+
+    def equity(self, hole_cards, community_cards, num_opponents, trials=EQUITY_TRIALS,
+               exact_limit=EXACT_EQUITY_LIMIT):
+        """
+        Same contract as equity.calculate_equity(): small spots are enumerated exactly
+        in this process, everything else is sampled across the pool.
+
+        returns: (equity, std_error)
+        """
+        if num_opponents == 0:
+            return 1.0, 0.0
+        if enumeration_size(hole_cards, community_cards, num_opponents) <= exact_limit:
+            equity, _ = equity_from_counts(*exact_counts(hole_cards, community_cards, num_opponents))
+            return equity, 0.0
+        return equity_from_counts(*self.counts(hole_cards, community_cards, num_opponents, trials))
+
+
+_default_service = None
+
+
+def get_service():
+    """
+    The shared, lazily started service reused across tables and decisions.
+    Poker.py's front end passes it to PokerGame. tournament.py does not use it,
+    since it already runs one batch of hands per core.
+    """
+    global _default_service
+    if _default_service is None:
+        _default_service = EquityService().start()
+    return _default_service
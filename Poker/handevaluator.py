@@ -1,16 +1,150 @@
 # hand_evaluator.py
 
-from itertools import combinations
+# Scores returned by evaluate() are plain ints: the category sits above
+# CATEGORY_SHIFT and up to five tie-break ranks (2..14) follow in 4-bit
+# slots, highest first. Comparing two scores compares the hands.
+CATEGORY_SHIFT = 20
+# Number of tie-break ranks carried by each category (index = category_rank)
+TIEBREAK_LEN = (5, 4, 3, 3, 1, 5, 2, 2, 1, 0)
 
-RANK_STR = "23456789TJQKA"
-RANK_MAP = {r: i + 2 for i, r in enumerate(RANK_STR)}  # '2'->2, ..., 'T'->10, 'J'->11, 'Q'->12, 'K'->13, 'A'->14
+
+def _pack(category, ranks):
+    score = category
+    for i in range(5):
+        score = (score << 4) | (ranks[i] if i < len(ranks) else 0)
+    return score
+
+
+def _top_ranks(mask, n):
+    # Highest n ranks (2..14) present in a 13-bit rank mask
+    ranks = []
+    bit = 12
+    while bit >= 0 and len(ranks) < n:
+        if mask & (1 << bit):
+            ranks.append(bit + 2)
+        bit -= 1
+    return ranks
+
+
+def _straight_high(mask):
+    for high in range(12, 3, -1):
+        run = 0b11111 << (high - 4)
+        if mask & run == run:
+            return high + 2
+    # A-2-3-4-5: ace plays low, the top card is the 5
+    wheel = (1 << 12) | 0b1111
+    if mask & wheel == wheel:
+        return 5
+    return 0
+
+
+# Lookup tables indexed by a 13-bit rank mask, built once at import
+POPCOUNT = [bin(m).count("1") for m in range(1 << 13)]
+STRAIGHT_HIGH = [_straight_high(m) for m in range(1 << 13)]
+FLUSH_SCORE = [0] * (1 << 13)
+for _mask in range(1 << 13):
+    if POPCOUNT[_mask] >= 5:
+        _high = STRAIGHT_HIGH[_mask]
+        if _high == 14:
+            FLUSH_SCORE[_mask] = _pack(9, ())
+        elif _high:
+            FLUSH_SCORE[_mask] = _pack(8, (_high,))
+        else:
+            FLUSH_SCORE[_mask] = _pack(5, _top_ranks(_mask, 5))
+
+# Per-card contributions: a rank-count key (3 bits per rank, summed over the
+# cards so it encodes the rank multiset) and the card's bit in its suit mask
+_CARD_KEY = [1 << (3 * (c >> 2)) for c in range(52)]
+_CARD_BIT = [1 << (c >> 2) for c in range(52)]
+
+# Rank-multiset key -> score for hands without a flush. Filled on first
+# sight of each multiset; there are fewer than 75k of them for 5-7 cards.
+_RANK_TABLE = {}
+
+
+def _score_rank_key(key):
+    present = quads = trips = pairs = 0
+    for r in range(13):
+        count = (key >> (3 * r)) & 7
+        if count:
+            bit = 1 << r
+            present |= bit
+            if count == 4:
+                quads |= bit
+            elif count == 3:
+                trips |= bit
+            elif count == 2:
+                pairs |= bit
+
+    if quads:
+        (four,) = _top_ranks(quads, 1)
+        return _pack(7, [four] + _top_ranks(present & ~(1 << (four - 2)), 1))
+    if trips and (pairs or POPCOUNT[trips] > 1):
+        (three,) = _top_ranks(trips, 1)
+        return _pack(6, [three] + _top_ranks((trips | pairs) & ~(1 << (three - 2)), 1))
+    high = STRAIGHT_HIGH[present]
+    if high:
+        return _pack(4, (high,))
+    if trips:
+        (three,) = _top_ranks(trips, 1)
+        return _pack(3, [three] + _top_ranks(present & ~(1 << (three - 2)), 2))
+    if POPCOUNT[pairs] >= 2:
+        top_pairs = _top_ranks(pairs, 2)
+        rest = present & ~(1 << (top_pairs[0] - 2)) & ~(1 << (top_pairs[1] - 2))
+        return _pack(2, top_pairs + _top_ranks(rest, 1))
+    if pairs:
+        (pair,) = _top_ranks(pairs, 1)
+        return _pack(1, [pair] + _top_ranks(present & ~(1 << (pair - 2)), 3))
+    return _pack(0, _top_ranks(present, 5))
+
+
+def evaluate(cards):
+    """
+    Score the best 5-card hand among 5 to 7 cards (ints, see cards.py)
+    in a single pass, without enumerating 5-card combinations.
+
+    returns: an int, higher is better. Use score_to_tuple() for the
+    (category_rank, tie-break...) form returned by hand_rank().
+    """
+    key = 0
+    s0 = s1 = s2 = s3 = 0
+    for c in cards:
+        key += _CARD_KEY[c]
+        suit = c & 3
+        if suit == 0:
+            s0 |= _CARD_BIT[c]
+        elif suit == 1:
+            s1 |= _CARD_BIT[c]
+        elif suit == 2:
+            s2 |= _CARD_BIT[c]
+        else:
+            s3 |= _CARD_BIT[c]
+
+    # With at most 7 cards a flush rules out quads and full houses,
+    # so the flush table alone decides the hand.
+    for mask in (s0, s1, s2, s3):
+        if POPCOUNT[mask] >= 5:
+            return FLUSH_SCORE[mask]
+
+    score = _RANK_TABLE.get(key)
+    if score is None:
+        score = _RANK_TABLE[key] = _score_rank_key(key)
+    return score
+
+
+def score_to_tuple(score):
+    """Convert an evaluate() score into the (category_rank, tie-break...) tuple."""
+    category = score >> CATEGORY_SHIFT
+    return (category,) + tuple(
+        (score >> (16 - 4 * i)) & 0xF for i in range(TIEBREAK_LEN[category])
+    )
 
 
 def hand_rank(cards):
     """
     Evaluate the best 5-card poker hand from the given 7 cards.
 
-    cards: list of strings like ['AH', 'KD', 'TC', '2S', ...] total 7 cards.
+    cards: list of 7 int-encoded cards (see cards.py), e.g. parse_card('AH').
 
     returns: a tuple that can be compared. Higher is better.
     The tuple format: (category_rank, tie-break detail...)
@@ -26,20 +160,14 @@ def hand_rank(cards):
         1 = One Pair
         0 = High Card
     """
-    best = None
-    # Generate all 5-card combinations from the 7 cards
-    for five in combinations(cards, 5):
-        score = hand_rank_5cards(five)
-        if best is None or score > best:
-            best = score
-    return best
+    return score_to_tuple(evaluate(cards))
 
 
 def hand_rank_5cards(cards):
     # cards: 5-card combination
     # Convert to ranks and suits
-    ranks = sorted([RANK_MAP[c[0]] for c in cards], reverse=True)
-    suits = [c[-1] for c in cards]
+    ranks = sorted([(c >> 2) + 2 for c in cards], reverse=True)
+    suits = [c & 3 for c in cards]
 
     # Count occurrences
     rank_counts = {}
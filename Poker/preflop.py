@@ -0,0 +1,111 @@
+# preflop.py
+#
+# Precomputed preflop equity for the 169 canonical starting hands against
+# 1 to MAX_OPPONENTS random hands. The table is generated once by running
+# this module (python preflop.py) and stored in preflop_equity.npy as
+# uint16 fixed-point equities; lookups load it lazily on first use.
+
+import argparse
+import os
+
+import numpy as np
+
+from cards import RANKS, make_card
+
+MAX_OPPONENTS = 4
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "preflop_equity.npy")
+_SCALE = 65535
+
+_table = None
+
+
+def starting_hand_index(hole_cards):
+    """
+    Canonical index 0..168 of a two-card holding, laid out as a 13x13 grid:
+    pairs on the diagonal, suited hands at [high][low], offsuit at [low][high].
+    """
+    r1, r2 = hole_cards[0] >> 2, hole_cards[1] >> 2
+    high, low = max(r1, r2), min(r1, r2)
+    if (hole_cards[0] & 3) == (hole_cards[1] & 3):
+        return high * 13 + low
+    return low * 13 + high
+
+
+def starting_hand_name(index):
+    """'AA', 'AKs', 'AKo', ..."""
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANKS[row] * 2
+    if row > col:
+        return RANKS[row] + RANKS[col] + "s"
+    return RANKS[col] + RANKS[row] + "o"
+
+
+def representative_hand(index):
+    """Two concrete cards for a canonical index."""
+    row, col = divmod(index, 13)
+    if row > col:
+        return [make_card(row, 0), make_card(col, 0)]
+    return [make_card(max(row, col), 0), make_card(min(row, col), 1)]
+
+
+def build_table(trials=100000, seed=0, equity_service=None):
+    """
+    Simulate every canonical hand against 1..MAX_OPPONENTS opponents.
+
+    returns: float array of shape (169, MAX_OPPONENTS); column n-1 holds
+    the equity against n opponents.
+    """
+    # Imported here so table lookups don't pay for the simulation engine
+    from equity import equity_from_counts, monte_carlo_counts
+
+    seeds = np.random.SeedSequence(seed).spawn(169 * MAX_OPPONENTS)
+    table = np.zeros((169, MAX_OPPONENTS))
+    for index in range(169):
+        hole = representative_hand(index)
+        for n in range(1, MAX_OPPONENTS + 1):
+            if equity_service is not None:
+                counts = equity_service.counts(hole, [], n, trials)
+            else:
+                counts = monte_carlo_counts(hole, [], n, trials, seeds[index * MAX_OPPONENTS + n - 1])
+            table[index, n - 1], _ = equity_from_counts(*counts)
+    return table
+
+
+def save_table(table, path=TABLE_PATH):
+    np.save(path, np.round(np.asarray(table) * _SCALE).astype(np.uint16))
+
+
+def load_table(path=TABLE_PATH):
+    """The equity table as floats; loaded from disk once and then cached."""
+    global _table
+    if _table is None:
+        _table = np.load(path).astype(np.float64) / _SCALE
+    return _table
+
+
+def preflop_equity(hole_cards, num_opponents):
+    """Equity of a starting hand against num_opponents (1..MAX_OPPONENTS) random hands."""
+    return float(load_table()[starting_hand_index(hole_cards), num_opponents - 1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the preflop equity table.")
+    parser.add_argument("--trials", type=int, default=100000, help="Monte Carlo trials per hand and opponent count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0, help="Spread trials over a process pool (0 = this process)")
+    parser.add_argument("--output", default=TABLE_PATH)
+    args = parser.parse_args()
+
+    if args.workers:
+        from equity_service import EquityService
+        with EquityService(max_workers=args.workers, seed=args.seed) as service:
+            table = build_table(args.trials, args.seed, service)
+    else:
+        table = build_table(args.trials, args.seed)
+    save_table(table, args.output)
+    print(f"Wrote {table.shape[0]}x{table.shape[1]} preflop equities to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+# test_botStrategy.py
+
+from botStrategy import tier_ranges
+
+
+def test_heads_up_tier_sizes():
+    sizes = {tier: len(hands) for tier, hands in tier_ranges(1).items()}
+    assert sizes == {'premium': 4, 'good': 12, 'medium': 7, 'weak': 146}
+
+
+def test_heads_up_tier_members():
+    ranges = tier_ranges(1)
+    assert sorted(ranges['premium']) == sorted(['AA', 'KK', 'QQ', 'JJ'])
+    assert sorted(ranges['good']) == sorted(['TT', '99', '88', '77', 'AKs', 'AQs', 'AJs', 'ATs',
+                                             'AKo', 'AQo', 'AJo', 'KQs'])
+    assert sorted(ranges['medium']) == sorted(['66', 'A9s', 'A8s', 'KJs', 'KTs', 'ATo', 'KQo'])
+
+
+def test_every_hand_in_one_tier():
+    for num_opponents in range(1, 5):
+        ranges = tier_ranges(num_opponents)
+        assert sum(len(hands) for hands in ranges.values()) == 169
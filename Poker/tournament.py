@@ -0,0 +1,191 @@
+# tournament.py
+#
+# Bot-vs-bot runner: plays large numbers of independent hands on the
+# headless engine across a process pool and reports each strategy's win
+# rate in big blinds per 100 hands with a 95% confidence interval.
+#
+#   python tournament.py --hands 1000000 --strategies bot_decision,equity_bot --workers 32
+#
+# Every hand starts from fresh stacks. The dealer button moves every hand
+# and the strategy line-up rotates one seat per orbit, so each strategy
+# plays every position equally often. Seats playing the same strategy in a
+# hand are not independent, so the confidence interval is computed over
+# hands from each strategy's net summed per hand. Per-batch totals are
+# streamed to --output as JSON lines, followed by a final summary line.
+
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from types import SimpleNamespace
+
+import numpy as np
+
+from botStrategy import bot_decision
+from constants import BIG_BLIND, INITIAL_STACK, SMALL_BLIND
+from engine import HandEngine
+
+
+def make_bot_decision_policy(options):
+    """botStrategy.bot_decision, translated to engine actions."""
+    def policy(state):
+        view = SimpleNamespace(hole_cards=state['hole_cards'], stack=state['stack'])
+        action, amount = bot_decision(view, state['board'], state['call_amount'], state['pot'],
+                                      state['street'], num_opponents=state['num_active'] - 1)
+        # bot_decision bets in chips added and raises by an amount over the current bet
+        if action == 'bet':
+            return action, state['street_bets'][state['seat']] + amount
+        if action == 'raise':
+            return action, state['current_bet'] + amount
+        return action, 0
+    return policy
+
+
+def make_equity_bot_policy(options):
+    """PokerGame.bot_action with its own equity trial count."""
+    from Poker import PokerGame
+    game = PokerGame(equity_trials=options.get('equity_trials', 1000))
+    return game.bot_action
+
+
+def make_caller_policy(options):
+    """Calls or checks every street; a baseline."""
+    return lambda state: ('call', 0)
+
+
+STRATEGIES = {
+    'bot_decision': make_bot_decision_policy,
+    'equity_bot': make_equity_bot_policy,
+    'caller': make_caller_policy,
+}
+
+
+def lineup(strategies, seats, hand_index):
+    """Strategy name per seat for a hand; the line-up shifts one seat every orbit."""
+    offset = hand_index // seats
+    return [strategies[(seat + offset) % len(strategies)] for seat in range(seats)]
+
+
+def play_batch(strategies, seats, first_hand, num_hands, seed, options):
+    """
+    Play hands first_hand .. first_hand + num_hands - 1.
+
+    returns: {strategy: [seat_hands, net_chips, hands, net_sq, seats_net, seats_sq]},
+    sums over the hands the strategy played of its seats k and net chips x
+    in that hand: k, x, 1, x * x, k * x, k * k.
+    """
+    rng = random.Random(seed)
+    random.seed(rng.random())  # the bots draw from the module-level RNG
+    policies = {name: STRATEGIES[name](options) for name in set(strategies)}
+    stack = options.get('stack', INITIAL_STACK)
+    totals = {name: [0, 0, 0, 0, 0, 0] for name in set(strategies)}
+
+    for hand_index in range(first_hand, first_hand + num_hands):
+        names = lineup(strategies, seats, hand_index)
+        engine = HandEngine([stack] * seats, dealer=hand_index % seats,
+                            small_blind=SMALL_BLIND, big_blind=BIG_BLIND, rng=rng)
+        while not engine.hand_over:
+            action, amount = policies[names[engine.to_act]](engine.state())
+            engine.apply_action(action, amount)
+        hand = {}
+        for name, end in zip(names, engine.stacks):
+            seats_net = hand.setdefault(name, [0, 0])
+            seats_net[0] += 1
+            seats_net[1] += end - stack
+        for name, (k, net) in hand.items():
+            total = totals[name]
+            total[0] += k
+            total[1] += net
+            total[2] += 1
+            total[3] += net * net
+            total[4] += k * net
+            total[5] += k * k
+    return totals
+
+
+def summarize(totals, big_blind=BIG_BLIND):
+    """
+    bb/100 and the half-width of its 95% confidence interval per strategy.
+    The win rate per seat-hand is a ratio of per-hand sums, so its standard
+    error comes from the per-hand residuals x - rate * k.
+    """
+    summary = {}
+    for name, (n, net, hands, net_sq, seats_net, seats_sq) in sorted(totals.items()):
+        mean = net / n if n else 0.0
+        residual_sq = max(net_sq - 2 * mean * seats_net + mean * mean * seats_sq, 0.0)
+        stderr = residual_sq ** 0.5 / n if n else 0.0
+        summary[name] = {
+            'hands': n,
+            'bb_per_100': 100 * mean / big_blind,
+            'ci95': 100 * 1.96 * stderr / big_blind,
+        }
+    return summary
+
+
+def run_tournament(strategies, hands, seats=6, workers=None, batch_size=2000, seed=0,
+                   output=None, options=None):
+    """
+    Play `hands` hands across a process pool, streaming batch totals to `output`
+    (a path for JSON lines, or None).
+
+    returns: the summarize() dict for all hands played.
+    """
+    options = options or {}
+    workers = workers or os.cpu_count() or 1
+    starts = list(range(0, hands, batch_size))
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(starts))]
+    totals = {name: [0, 0, 0, 0, 0, 0] for name in set(strategies)}
+
+    out = open(output, 'w') if output else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(play_batch, strategies, seats, start, min(batch_size, hands - start), s, options): start
+                for start, s in zip(starts, seeds)
+            }
+            for future in as_completed(futures):
+                batch = future.result()
+                for name, values in batch.items():
+                    for i, v in enumerate(values):
+                        totals[name][i] += v
+                if out:
+                    out.write(json.dumps({'first_hand': futures[future], 'totals': batch}) + '\n')
+                    out.flush()
+        summary = summarize(totals)
+        if out:
+            out.write(json.dumps({'summary': summary}) + '\n')
+    finally:
+        if out:
+            out.close()
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play bot strategies against each other at scale.")
+    parser.add_argument("--hands", type=int, default=100000)
+    parser.add_argument("--seats", type=int, default=6)
+    parser.add_argument("--strategies", default="bot_decision,equity_bot",
+                        help=f"Comma-separated, from: {', '.join(STRATEGIES)}")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (0 = all cores)")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stack", type=int, default=INITIAL_STACK)
+    parser.add_argument("--equity-trials", type=int, default=1000, help="Monte Carlo trials per equity_bot decision")
+    parser.add_argument("--output", default="tournament_results.jsonl")
+    args = parser.parse_args()
+
+    strategies = args.strategies.split(',')
+    unknown = [s for s in strategies if s not in STRATEGIES]
+    if unknown:
+        parser.error(f"Unknown strategies: {', '.join(unknown)}")
+
+    summary = run_tournament(strategies, args.hands, args.seats, args.workers or None, args.batch_size,
+                             args.seed, args.output, {'stack': args.stack, 'equity_trials': args.equity_trials})
+    print(f"{'Strategy':<15}{'Seat-hands':>12}{'bb/100':>10}{'95% CI':>10}")
+    for name, row in summary.items():
+        print(f"{name:<15}{row['hands']:>12}{row['bb_per_100']:>10.2f}{row['ci95']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()